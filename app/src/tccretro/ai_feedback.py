@@ -1,17 +1,248 @@
 """Amazon Bedrock (Claude) によるAI分析モジュール."""
 
+import copy
+import io
 import json
 import logging
 import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import date, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Final
 
 import boto3
+import jpholiday
+import pandas as pd
 import yaml
 from botocore.config import Config
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjsonは任意依存
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# 設定ファイルのデフォルトパス（app/ ディレクトリ配下）
+_PKG_ROOT = Path(__file__).resolve().parent.parent.parent
+_DEFAULT_DEFINITIONS_PATH = _PKG_ROOT / "project_definitions.yaml"
+_DEFAULT_TEMPLATE_PATH = _PKG_ROOT / "config" / "prompt_template.md"
+
+# libyamlバインディングが利用可能ならC実装のローダーを使用（未導入時はPure Python実装）
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# AIに提供するCSVサンプルのカラム（出力順）
+_RELEVANT_COLUMNS = pd.Index(
+    [
+        "タイムライン日付",
+        "タスク名",
+        "プロジェクト名",
+        "モード名",
+        "ルーチン名",
+        "見積時間",
+        "実績時間",
+        "開始日時",
+        "終了日時",
+    ]
+)
+
+# テンプレートファイルが見つからない場合に使用する標準プロンプトテンプレート
+_DEFAULT_PROMPT_TEMPLATE: Final[str] = """あなたは時間管理とライフスタイル改善のエキスパートです。
+以下のTaskChute Cloudのデータ分析結果をもとに、より良い暮らしのための時間の使い方についての詳細なフィードバックを提供してください。
+{date_info_section}
+{project_definitions_section}
+
+# プロジェクト別分析データ
+```json
+{project_data}
+```
+
+# モード別分析データ
+```json
+{mode_data}
+```
+
+# ルーチン別分析データ
+```json
+{routine_data}
+```
+{csv_sample_section}
+以下の観点から分析とフィードバックを提供してください：
+
+## 1. 現状分析
+- 時間の使い方の傾向と特徴
+- バランスの良い点と課題点
+- 特に注目すべきプロジェクトやモード
+- ルーチンタスクと非ルーチンタスクの割合とその意味
+
+## 2. 改善提案
+- より良い時間配分のための具体的な提案
+- ワークライフバランスの改善案
+- 優先順位付けのアドバイス
+- ルーチン化できるタスクやルーチンの見直しについて
+
+## 3. アクションプラン
+- 今週から実践できる具体的な行動
+- 短期目標（1週間）と中期目標（1ヶ月）
+- 進捗を測定する指標
+
+回答はMarkdown形式で、見出しを使って構造化してください。
+具体的で実践的なアドバイスを心がけてください。"""
+
+# ストリーミングが途中で失敗した場合に、出力済みの部分的なテキストの後へ出力する区切り
+_STREAM_INTERRUPTED_NOTICE = (
+    "\n\n---\n⚠ AIフィードバックの受信が中断されました。"
+    "上記は不完全な出力のため、レポートには簡易フィードバックを記載します。\n"
+)
+
+# プロンプトテンプレートのプレースホルダー（例: {project_data}）
+_PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+
+# date.weekday() の戻り値（0=月曜日）に対応する曜日名
+_WEEKDAY_JA = ("月", "火", "水", "木", "金", "土", "日")
+
+# Bedrock Runtimeクライアントのキャッシュ（(リージョン, 読み取りタイムアウト, 接続タイムアウト) -> クライアント）
+# サービスモデルの読み込みやコネクションプールをインスタンス間で再利用する
+_READ_TIMEOUT_SEC = 180
+_CONNECT_TIMEOUT_SEC = 60
+_client_cache: dict[tuple[str, int, int], Any] = {}
+_client_cache_lock = threading.Lock()
+
+# 設定ファイルの読み込みキャッシュ（絶対パス -> (mtime_ns, サイズ, 内容)）
+_CACHE_MAX_ENTRIES = 100
+_definitions_cache: OrderedDict[str, tuple[int, int, dict[str, Any]]] = OrderedDict()
+_template_cache: OrderedDict[str, tuple[int, int, str]] = OrderedDict()
+
+# 日付ごとの休日・祝日判定結果のキャッシュ（日付の序数 -> フォーマット済み文字列）
+_DAY_CACHE_MAX_ENTRIES = 8192
+_day_descriptions: dict[int, str] = {}
+
+
+def _has_rows(data: Any) -> bool:
+    """CSVサンプルの抽出対象となるデータがあるかどうかを返す.
+
+    DataFrame以外の入力は empty 属性を持つ場合のみ空かどうかを判定し、
+    どちらの呼び出し元でも同じ基準で扱う。
+
+    Args:
+        data: pandas DataFrame、またはNone
+
+    Returns:
+        bool: Noneでも空でもない場合True
+    """
+    return data is not None and not getattr(data, "empty", False)
+
+
+def _format_day(day: date, holidays: dict[date, str]) -> str:
+    """日付を曜日と休日・祝日の区分付きでフォーマットする.
+
+    Args:
+        day: 対象日
+        holidays: 祝日とその名称の辞書
+
+    Returns:
+        str: 例 "2025-11-03 (月曜日): 祝日 - 文化の日"
+    """
+    weekday = day.weekday()
+    prefix = f"{day} ({_WEEKDAY_JA[weekday]}曜日)"
+
+    holiday_name = holidays.get(day)
+    if holiday_name:
+        return f"{prefix}: 祝日 - {holiday_name}"
+    if weekday == 5:
+        return f"{prefix}: 土曜日"
+    if weekday == 6:
+        return f"{prefix}: 日曜日"
+    return f"{prefix}: 平日"
+
+
+def _describe_days(start: date, end: date) -> list[str]:
+    """期間内の各日付を曜日と休日・祝日の区分付きでフォーマットする.
+
+    未判定の日付を含む場合は、その範囲の祝日を jpholiday.between で一括取得する。
+    判定結果は日付の序数単位でキャッシュし、重複する期間では再利用する。
+
+    Args:
+        start: 開始日
+        end: 終了日
+
+    Returns:
+        list[str]: 日付ごとのフォーマット済み文字列
+    """
+    ordinals = range(start.toordinal(), end.toordinal() + 1)
+    missing = [ordinal for ordinal in ordinals if ordinal not in _day_descriptions]
+    if missing:
+        if len(_day_descriptions) + len(missing) > _DAY_CACHE_MAX_ENTRIES:
+            _day_descriptions.clear()
+        first, last = date.fromordinal(missing[0]), date.fromordinal(missing[-1])
+        holidays = dict(jpholiday.between(first, last))
+        for ordinal in missing:
+            _day_descriptions[ordinal] = _format_day(date.fromordinal(ordinal), holidays)
+    return [_day_descriptions[ordinal] for ordinal in ordinals]
+
+
+def _to_json(obj: Any) -> str:
+    """プロンプト埋め込み用にオブジェクトをインデント付きJSON文字列へ変換する.
+
+    orjsonがインストールされていれば高速なorjsonを使用し、なければ標準のjsonを使用します。
+
+    Args:
+        obj: 変換対象のオブジェクト
+
+    Returns:
+        str: JSON文字列
+    """
+    if orjson is not None:
+        try:
+            option = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            return orjson.dumps(obj, option=option).decode("utf-8")
+        except TypeError:
+            # orjsonが扱えない型を含む場合は標準のjsonで変換する
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def _cache_get(
+    cache: OrderedDict[str, tuple[int, int, Any]], path: Path, stat: os.stat_result
+) -> Any | None:
+    """ファイルが更新されていなければキャッシュ済みの内容を返す.
+
+    Args:
+        cache: 対象のキャッシュ
+        path: ファイルパス
+        stat: ファイルのstat結果
+
+    Returns:
+        Any | None: キャッシュ済みの内容。未キャッシュまたは更新済みの場合はNone
+    """
+    key = str(path.absolute())
+    entry = cache.get(key)
+    if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+        return None
+    cache.move_to_end(key)
+    return entry[2]
+
+
+def _cache_put(
+    cache: OrderedDict[str, tuple[int, int, Any]], path: Path, stat: os.stat_result, value: Any
+) -> None:
+    """ファイルの内容をmtimeとサイズとともにキャッシュする.
+
+    Args:
+        cache: 対象のキャッシュ
+        path: ファイルパス
+        stat: ファイルのstat結果
+        value: キャッシュする内容
+    """
+    key = str(path.absolute())
+    cache[key] = (stat.st_mtime_ns, stat.st_size, value)
+    cache.move_to_end(key)
+    while len(cache) > _CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+
 
 class AIFeedbackGenerator:
     """Amazon Bedrock (Claude) を使用してデータ分析とフィードバックを生成するクラス."""
@@ -34,6 +265,10 @@ class AIFeedbackGenerator:
         self.project_definitions = self._load_project_definitions(project_definitions_path)
         self.prompt_template_path = prompt_template_path
 
+        # プロンプトの固定部分は生成のたびに変わらないため事前に準備しておく
+        self._template = self._load_prompt_template() or self._get_default_prompt_template()
+        self._formatted_project_definitions = self._format_project_definitions()
+
     def _create_bedrock_client(self) -> Any:
         """Bedrock Runtimeクライアントを作成する.
 
@@ -48,18 +283,30 @@ class AIFeedbackGenerator:
         try:
             # AWS認証情報を環境変数から取得
             aws_region = os.getenv("AWS_REGION", "us-east-1")
+            cache_key = (aws_region, _READ_TIMEOUT_SEC, _CONNECT_TIMEOUT_SEC)
+
+            with _client_cache_lock:
+                client = _client_cache.get(cache_key)
+                if client is not None:
+                    return client
+
+                # タイムアウト設定を追加（Claude Sonnet 4.5は応答に時間がかかるため）
+                # キープアライブとコネクションプールで接続を再利用し、スロットリング時は適応的にリトライ
+                config = Config(
+                    read_timeout=_READ_TIMEOUT_SEC,  # 読み取りタイムアウト: 3分
+                    connect_timeout=_CONNECT_TIMEOUT_SEC,  # 接続タイムアウト: 1分
+                    tcp_keepalive=True,
+                    max_pool_connections=10,
+                    retries={"mode": "adaptive", "max_attempts": 3},
+                )
 
-            # タイムアウト設定を追加（Claude Sonnet 4.5は応答に時間がかかるため）
-            config = Config(
-                read_timeout=180,  # 読み取りタイムアウト: 3分
-                connect_timeout=60,  # 接続タイムアウト: 1分
-            )
+                client = boto3.client(
+                    service_name="bedrock-runtime",
+                    region_name=aws_region,
+                    config=config,
+                )
+                _client_cache[cache_key] = client
 
-            client = boto3.client(
-                service_name="bedrock-runtime",
-                region_name=aws_region,
-                config=config,
-            )
             logger.info("Bedrock Runtimeクライアントを初期化しました (region: %s)", aws_region)
             return client
         except Exception as e:
@@ -79,26 +326,30 @@ class AIFeedbackGenerator:
             FileNotFoundError: YAMLファイルが見つからない場合
             yaml.YAMLError: YAMLのパースエラー
         """
-        if definitions_path is None:
-            # デフォルトパス: このファイルの親ディレクトリの親の親/project_definitions.yaml
-            current_file = Path(__file__)
-            definitions_path = str(current_file.parent.parent.parent / "project_definitions.yaml")
+        path = _DEFAULT_DEFINITIONS_PATH if definitions_path is None else Path(definitions_path)
 
-        path = Path(definitions_path)
-
-        if not path.exists():
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                stat = os.fstat(f.fileno())
+                cached = _cache_get(_definitions_cache, path, stat)
+                if cached is not None:
+                    # 呼び出し側での変更がキャッシュに波及しないようコピーを返す
+                    return copy.deepcopy(cached)
+
+                data = yaml.load(f, Loader=_YAML_LOADER)
+                logger.info("プロジェクト定義を読み込みました: %s", path)
+            projects: dict[str, Any] = data.get("projects", {}) if data else {}
+            _cache_put(_definitions_cache, path, stat, projects)
+            return copy.deepcopy(projects)
+        except FileNotFoundError:
             logger.warning(
                 "プロジェクト定義ファイルが見つかりません: %s。空の定義を使用します。",
-                definitions_path,
+                path,
             )
             return {}
-
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
-                logger.info("プロジェクト定義を読み込みました: %s", definitions_path)
-                return data.get("projects", {}) if data else {}
         except yaml.YAMLError as e:
+            # NOTE: 大きな定義ファイルの読み込みを高速化するには、libyamlバインディング付きで
+            # ビルドされたPyYAMLの導入を推奨（CSafeLoaderが使われる。未導入時はPure Python実装）
             logger.error("プロジェクト定義の読み込みに失敗しました: %s", e)
             return {}
 
@@ -111,16 +362,13 @@ class AIFeedbackGenerator:
         if not self.project_definitions:
             return ""
 
-        lines = ["# プロジェクト定義", "", "以下は各プロジェクトの定義です：", ""]
-
-        for project_name, project_info in self.project_definitions.items():
-            description = project_info.get("description", "").strip()
-            if description:
-                lines.append(f"## {project_name}")
-                lines.append(description)
-                lines.append("")
-
-        return "\n".join(lines)
+        header = "# プロジェクト定義\n\n以下は各プロジェクトの定義です：\n"
+        body = "".join(
+            f"\n## {project_name}\n{description}\n"
+            for project_name, project_info in self.project_definitions.items()
+            if (description := project_info.get("description", "").strip())
+        )
+        return header + body
 
     def _load_prompt_template(self) -> str | None:
         """プロンプトテンプレートファイルを読み込む.
@@ -129,24 +377,27 @@ class AIFeedbackGenerator:
             str | None: テンプレートファイルの内容。ファイルが見つからない場合はNone
         """
         if self.prompt_template_path is None:
-            # デフォルトパス: このファイルの親ディレクトリの親の親/config/prompt_template.md
-            current_file = Path(__file__)
-            template_path = current_file.parent.parent.parent / "config" / "prompt_template.md"
+            template_path = _DEFAULT_TEMPLATE_PATH
         else:
             template_path = Path(self.prompt_template_path)
 
-        if not template_path.exists():
+        try:
+            with template_path.open("r", encoding="utf-8") as f:
+                stat = os.fstat(f.fileno())
+                cached = _cache_get(_template_cache, template_path, stat)
+                if cached is not None:
+                    return str(cached)
+
+                template = f.read()
+                logger.info("プロンプトテンプレートを読み込みました: %s", template_path)
+            _cache_put(_template_cache, template_path, stat, template)
+            return template
+        except FileNotFoundError:
             logger.warning(
                 "プロンプトテンプレートファイルが見つかりません: %s。標準プロンプトを使用します。",
                 template_path,
             )
             return None
-
-        try:
-            with template_path.open("r", encoding="utf-8") as f:
-                template = f.read()
-                logger.info("プロンプトテンプレートを読み込みました: %s", template_path)
-                return template
         except Exception as e:
             logger.error("プロンプトテンプレートの読み込みに失敗しました: %s", e)
             return None
@@ -157,47 +408,7 @@ class AIFeedbackGenerator:
         Returns:
             str: 標準プロンプトテンプレート
         """
-        return """あなたは時間管理とライフスタイル改善のエキスパートです。
-以下のTaskChute Cloudのデータ分析結果をもとに、より良い暮らしのための時間の使い方についての詳細なフィードバックを提供してください。
-{date_info_section}
-{project_definitions_section}
-
-# プロジェクト別分析データ
-```json
-{project_data}
-```
-
-# モード別分析データ
-```json
-{mode_data}
-```
-
-# ルーチン別分析データ
-```json
-{routine_data}
-```
-{csv_sample_section}
-以下の観点から分析とフィードバックを提供してください：
-
-## 1. 現状分析
-- 時間の使い方の傾向と特徴
-- バランスの良い点と課題点
-- 特に注目すべきプロジェクトやモード
-- ルーチンタスクと非ルーチンタスクの割合とその意味
-
-## 2. 改善提案
-- より良い時間配分のための具体的な提案
-- ワークライフバランスの改善案
-- 優先順位付けのアドバイス
-- ルーチン化できるタスクやルーチンの見直しについて
-
-## 3. アクションプラン
-- 今週から実践できる具体的な行動
-- 短期目標（1週間）と中期目標（1ヶ月）
-- 進捗を測定する指標
-
-回答はMarkdown形式で、見出しを使って構造化してください。
-具体的で実践的なアドバイスを心がけてください。"""
+        return _DEFAULT_PROMPT_TEMPLATE
 
     def _extract_relevant_csv_data(self, data: Any, max_rows: int = 1000) -> str:
         """CSVデータから必要なカラムのみを抽出してサンプルを作成する.
@@ -209,22 +420,12 @@ class AIFeedbackGenerator:
         Returns:
             str: CSV形式のサンプルデータ
         """
+        if not _has_rows(data):
+            return ""
+
         try:
-            # 分析に必要なカラムのみを抽出
-            relevant_columns = [
-                "タイムライン日付",
-                "タスク名",
-                "プロジェクト名",
-                "モード名",
-                "ルーチン名",
-                "見積時間",
-                "実績時間",
-                "開始日時",
-                "終了日時",
-            ]
-
-            # 存在するカラムのみを抽出
-            available_columns = [col for col in relevant_columns if col in data.columns]
+            # 分析に必要なカラムのうち、存在するカラムのみを抽出
+            available_columns = _RELEVANT_COLUMNS.intersection(data.columns, sort=False).tolist()
 
             if not available_columns:
                 return ""
@@ -239,12 +440,13 @@ class AIFeedbackGenerator:
                     max_rows,
                 )
 
-            # サンプルデータを抽出（最初のmax_rows行）
-            sample_data = data[available_columns].head(max_rows)
+            # サンプルデータを抽出（先に行を絞ってからカラムを射影し、不要なコピーを避ける）
+            sample_data = data.head(max_rows).loc[:, available_columns]
 
-            # CSV形式に変換
-            csv_string: str | None = sample_data.to_csv(index=False)
-            return csv_string if csv_string is not None else ""
+            # CSV形式に変換（バッファへ直接書き出す）
+            buffer = io.StringIO()
+            sample_data.to_csv(buffer, index=False, lineterminator="\n")
+            return buffer.getvalue()
 
         except Exception as e:
             logger.warning("CSVサンプルデータの抽出に失敗しました: %s", e)
@@ -261,47 +463,12 @@ class AIFeedbackGenerator:
             str: 休日情報の文字列
         """
         try:
-            import datetime
-
-            import jpholiday
-
             # 日付をパース
-            start = datetime.datetime.strptime(start_date, "%Y-%m-%d").date()
-            end = datetime.datetime.strptime(end_date, "%Y-%m-%d").date()
-
-            # 期間内の各日付を確認
-            holiday_info_list = []
-            current = start
-            while current <= end:
-                day_info = []
-
-                # 曜日を取得
-                weekday = current.strftime("%A")
-                weekday_ja = {
-                    "Monday": "月",
-                    "Tuesday": "火",
-                    "Wednesday": "水",
-                    "Thursday": "木",
-                    "Friday": "金",
-                    "Saturday": "土",
-                    "Sunday": "日",
-                }.get(weekday, "")
-
-                # 休日・祝日判定
-                if jpholiday.is_holiday(current):
-                    holiday_name = jpholiday.is_holiday_name(current)
-                    day_info.append(f"{current} ({weekday_ja}曜日): 祝日 - {holiday_name}")
-                elif current.weekday() == 5:  # 土曜日
-                    day_info.append(f"{current} ({weekday_ja}曜日): 土曜日")
-                elif current.weekday() == 6:  # 日曜日
-                    day_info.append(f"{current} ({weekday_ja}曜日): 日曜日")
-                else:
-                    day_info.append(f"{current} ({weekday_ja}曜日): 平日")
-
-                if day_info:
-                    holiday_info_list.extend(day_info)
-
-                current += datetime.timedelta(days=1)
+            start = datetime.strptime(start_date, "%Y-%m-%d").date()
+            end = datetime.strptime(end_date, "%Y-%m-%d").date()
+
+            # 各日付を分類（祝日は範囲で一括取得し、判定結果は日付単位でキャッシュされる）
+            holiday_info_list = _describe_days(start, end)
 
             if holiday_info_list:
                 return "\n" + "\n".join(holiday_info_list)
@@ -319,9 +486,12 @@ class AIFeedbackGenerator:
         data: Any | None = None,
         start_date: str | None = None,
         end_date: str | None = None,
+        on_chunk: Callable[[str], None] | None = None,
     ) -> str:
         """分析データをもとにAIフィードバックを生成する.
 
+        レスポンスはストリーミングで受信し、受信したテキストを順次 on_chunk に渡します。
+
         Args:
             project_summary: プロジェクト別分析のサマリー
             mode_summary: モード別分析のサマリー
@@ -329,6 +499,7 @@ class AIFeedbackGenerator:
             data: 元のCSVデータ（pandas DataFrame）
             start_date: 分析開始日（YYYY-MM-DD形式）
             end_date: 分析終了日（YYYY-MM-DD形式）
+            on_chunk: テキストを受信するたびに呼び出されるコールバック（オプション）
 
         Returns:
             str: 生成されたフィードバック（Markdown形式）
@@ -345,9 +516,10 @@ class AIFeedbackGenerator:
             end_date,
         )
 
+        chunks: list[str] = []
         try:
-            # Bedrock APIを呼び出し
-            response = self.bedrock_client.converse(
+            # Bedrock APIを呼び出し（ストリーミング）
+            response = self.bedrock_client.converse_stream(
                 modelId=self.model_id,
                 messages=[
                     {
@@ -361,8 +533,15 @@ class AIFeedbackGenerator:
                 },
             )
 
-            # レスポンスからテキストを抽出
-            feedback: str = response["output"]["message"]["content"][0]["text"]
+            # ストリームからテキストを順次抽出
+            for event in response["stream"]:
+                text = event.get("contentBlockDelta", {}).get("delta", {}).get("text")
+                if text:
+                    chunks.append(text)
+                    if on_chunk is not None:
+                        on_chunk(text)
+
+            feedback = "".join(chunks)
             logger.info("AI分析が完了しました")
             return feedback
 
@@ -380,6 +559,10 @@ class AIFeedbackGenerator:
                         "詳細: https://console.aws.amazon.com/bedrock/home#/model-catalog"
                     )
 
+            # 途中まで出力済みの場合は、部分的なテキストとフォールバックを区別できるよう区切る
+            if chunks and on_chunk is not None:
+                on_chunk(_STREAM_INTERRUPTED_NOTICE)
+
             return self._generate_fallback_feedback(project_summary, mode_summary, routine_summary)
 
     def _build_prompt(
@@ -404,12 +587,9 @@ class AIFeedbackGenerator:
         Returns:
             str: 構築されたプロンプト
         """
-        project_data = json.dumps(project_summary, ensure_ascii=False, indent=2)
-        mode_data = json.dumps(mode_summary, ensure_ascii=False, indent=2)
-        routine_data = json.dumps(routine_summary, ensure_ascii=False, indent=2)
-
-        # プロジェクト定義セクションを取得
-        project_definitions_section = self._format_project_definitions()
+        project_data = _to_json(project_summary)
+        mode_data = _to_json(mode_summary)
+        routine_data = _to_json(routine_summary)
 
         # 日付情報セクション
         date_info_section = ""
@@ -422,27 +602,25 @@ class AIFeedbackGenerator:
 
         # CSVサンプルデータセクション
         csv_sample_section = ""
-        if data is not None:
+        if _has_rows(data):
             csv_sample = self._extract_relevant_csv_data(data)
             if csv_sample:
                 csv_sample_section = (
                     f"\n# 生データサンプル（参考情報）\n\n```csv\n{csv_sample}\n```\n"
                 )
 
-        # プロンプトテンプレートを読み込む（見つからない場合は標準プロンプトを使用）
-        template = self._load_prompt_template()
-        if template is None:
-            template = self._get_default_prompt_template()
-
-        # プレースホルダーを置換
-        prompt = template.replace("{date_info_section}", date_info_section)
-        prompt = prompt.replace("{project_definitions_section}", project_definitions_section)
-        prompt = prompt.replace("{project_data}", project_data)
-        prompt = prompt.replace("{mode_data}", mode_data)
-        prompt = prompt.replace("{routine_data}", routine_data)
-        prompt = prompt.replace("{csv_sample_section}", csv_sample_section)
-
-        return prompt
+        # プレースホルダーを1パスで置換（未知のプレースホルダーや波括弧はそのまま残す）
+        substitutions = {
+            "date_info_section": date_info_section,
+            "project_definitions_section": self._formatted_project_definitions,
+            "project_data": project_data,
+            "mode_data": mode_data,
+            "routine_data": routine_data,
+            "csv_sample_section": csv_sample_section,
+        }
+        return _PLACEHOLDER_PATTERN.sub(
+            lambda m: substitutions.get(m.group(1), m.group(0)), self._template
+        )
 
     def _generate_fallback_feedback(
         self,
@@ -460,61 +638,47 @@ class AIFeedbackGenerator:
         Returns:
             str: 基本的なフィードバック（Markdown形式）
         """
-        lines = [
-            "## AI分析結果",
-            "",
-            "> **注意**: AI分析サービスに接続できませんでした。基本的な分析結果を表示します。",
-            "",
-            "### プロジェクト別の傾向",
-            "",
-            f"- 合計 {project_summary.get('total_projects', 0)} プロジェクトで活動",
-            f"- 総時間: {project_summary.get('total_hours', 0):.2f} 時間",
-        ]
-
         top_project = project_summary.get("top_project")
-        if top_project:
-            top_hours = project_summary.get("top_project_hours", 0)
-            lines.append(f"- 最も時間を使ったプロジェクト: **{top_project}** ({top_hours:.2f}時間)")
-
-        lines.extend(
-            [
-                "",
-                "### モード別の傾向",
-                "",
-                f"- 合計 {mode_summary.get('total_modes', 0)} モードで活動",
-                f"- 総時間: {mode_summary.get('total_hours', 0):.2f} 時間",
-            ]
+        top_project_line = (
+            f"\n- 最も時間を使ったプロジェクト: **{top_project}** "
+            f"({project_summary.get('top_project_hours', 0):.2f}時間)"
+            if top_project
+            else ""
         )
-
         top_mode = mode_summary.get("top_mode")
-        if top_mode:
-            top_mode_hours = mode_summary.get("top_mode_hours", 0)
-            lines.append(f"- 最も時間を使ったモード: **{top_mode}** ({top_mode_hours:.2f}時間)")
-
-        lines.extend(
-            [
-                "",
-                "### ルーチン別の傾向",
-                "",
-                f"- 総時間: {routine_summary.get('total_hours', 0):.2f} 時間",
-                f"- ルーチンタスク: {routine_summary.get('routine_hours', 0):.2f} 時間 "
-                f"({routine_summary.get('routine_percentage', 0):.1f}%)",
-                f"- 非ルーチンタスク: {routine_summary.get('non_routine_hours', 0):.2f} 時間 "
-                f"({routine_summary.get('non_routine_percentage', 0):.1f}%)",
-            ]
+        top_mode_line = (
+            f"\n- 最も時間を使ったモード: **{top_mode}** "
+            f"({mode_summary.get('top_mode_hours', 0):.2f}時間)"
+            if top_mode
+            else ""
         )
 
-        lines.extend(
-            [
-                "",
-                "### 推奨事項",
-                "",
-                "- 時間配分を定期的に見直しましょう",
-                "- バランスの取れた生活を心がけましょう",
-                "- 優先順位の高いタスクに集中しましょう",
-                "- ルーチン化できるタスクを見つけて効率化しましょう",
-                "",
-            ]
-        )
+        return f"""## AI分析結果
+
+> **注意**: AI分析サービスに接続できませんでした。基本的な分析結果を表示します。
+
+### プロジェクト別の傾向
+
+- 合計 {project_summary.get("total_projects", 0)} プロジェクトで活動
+- 総時間: {project_summary.get("total_hours", 0):.2f} 時間{top_project_line}
+
+### モード別の傾向
+
+- 合計 {mode_summary.get("total_modes", 0)} モードで活動
+- 総時間: {mode_summary.get("total_hours", 0):.2f} 時間{top_mode_line}
+
+### ルーチン別の傾向
+
+- 総時間: {routine_summary.get("total_hours", 0):.2f} 時間
+- ルーチンタスク: {routine_summary.get("routine_hours", 0):.2f} 時間 \
+({routine_summary.get("routine_percentage", 0):.1f}%)
+- 非ルーチンタスク: {routine_summary.get("non_routine_hours", 0):.2f} 時間 \
+({routine_summary.get("non_routine_percentage", 0):.1f}%)
+
+### 推奨事項
 
-        return "\n".join(lines)
+- 時間配分を定期的に見直しましょう
+- バランスの取れた生活を心がけましょう
+- 優先順位の高いタスクに集中しましょう
+- ルーチン化できるタスクを見つけて効率化しましょう
+"""
@@ -1,15 +1,34 @@
 """TaskChute Cloudエクスポート自動化のためのCLIツール (ローカル実行)."""
 
+import logging
 import sys
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 import click
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
 
-from tccretro.export import TaskChuteExporter
-from tccretro.login import create_login_from_env
+
+class _EchoHandler(logging.Handler):
+    """ログレコードをclick.echoで出力するハンドラ."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            click.echo(self.format(record), err=record.levelno >= logging.WARNING)
+        except Exception:
+            self.handleError(record)
+
+
+def _configure_export_logging(debug: bool) -> None:
+    """エクスポート処理の進捗ログを出力するよう設定する.
+
+    Args:
+        debug: Trueの場合は詳細 (DEBUG) ログも出力する
+    """
+    export_logger = logging.getLogger("tccretro.export")
+    export_logger.setLevel(logging.DEBUG if debug else logging.INFO)
+    if not any(isinstance(h, _EchoHandler) for h in export_logger.handlers):
+        export_logger.addHandler(_EchoHandler())
 
 
 @click.command()
@@ -90,9 +109,9 @@ def main(
     slow_mo: int,
     output_dir: str,
     env_file: str | None,
-    export_date: date | None,
-    export_start_date: date | None,
-    export_end_date: date | None,
+    export_date: datetime | None,
+    export_start_date: datetime | None,
+    export_end_date: datetime | None,
     analyze: bool,
     no_ai: bool,
     model_id: str,
@@ -105,6 +124,8 @@ def main(
     else:
         load_dotenv()  # .envファイルがあれば読み込む（なくてもエラーにならない）
 
+    _configure_export_logging(debug)
+
     # Create output directory
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
@@ -115,14 +136,13 @@ def main(
 
     if export_date:
         # Single date specified
-        start_date = export_date.date() if hasattr(export_date, "date") else export_date
+        # click.DateTime は datetime を返すため日付部分のみを使用
+        start_date = export_date.date()
         end_date = start_date
     elif export_start_date and export_end_date:
         # Range specified
-        start_date = (
-            export_start_date.date() if hasattr(export_start_date, "date") else export_start_date
-        )
-        end_date = export_end_date.date() if hasattr(export_end_date, "date") else export_end_date
+        start_date = export_start_date.date()
+        end_date = export_end_date.date()
     elif export_start_date or export_end_date:
         click.echo(
             "エラー: --export-start-date と --export-end-date は両方指定する必要があります",
@@ -148,12 +168,15 @@ def main(
     # エクスポート処理の場合、既存ファイルを事前チェック
     exported_file = None
     if not login_only:
+        # Playwright等の重い依存は必要になるまで読み込まない（--help等の起動を速くするため）
+        from tccretro.export import TaskChuteExporter
+
         exporter = TaskChuteExporter(download_dir=str(output_path), debug=debug)
-        existing_dates, missing_dates = exporter.check_existing_files(start_date, end_date)
+        missing_ranges = TaskChuteExporter.plan_export(output_path, start_date, end_date)
 
-        # 全てのファイルが存在する場合、ログイン処理もスキップ
-        if not missing_dates and existing_dates:
-            first_existing_file = exporter.get_expected_filename(existing_dates[0])
+        # 全てのファイルが存在する場合、ブラウザ起動とログイン処理もスキップ
+        if not missing_ranges and start_date <= end_date:
+            first_existing_file = exporter.get_expected_filename(start_date)
             click.echo(
                 f"\n全ての日付のファイルが既に存在します ({start_date} 〜 {end_date})。"
                 f"スキップします: {first_existing_file}"
@@ -166,15 +189,19 @@ def main(
     try:
         # 既存ファイルが全て揃っている場合は、ログイン処理をスキップ
         if exported_file is None:
+            from playwright.sync_api import sync_playwright
+
+            from tccretro.login import create_login_from_env
+
+            # Create persistent profile directory
+            profile_dir = Path("./chrome-profile")
+            profile_dir.mkdir(parents=True, exist_ok=True)
+
             # Initialize components
-            login_handler = create_login_from_env()
+            login_handler = create_login_from_env(state_dir=profile_dir)
 
             # Run Playwright automation with persistent Chrome profile
             with sync_playwright() as p:
-                # Create persistent profile directory
-                profile_dir = Path("./chrome-profile")
-                profile_dir.mkdir(parents=True, exist_ok=True)
-
                 # Launch Chrome with persistent context
                 click.echo("\n[0/2] Chrome を起動中...")
                 context = p.chromium.launch_persistent_context(
@@ -184,6 +211,8 @@ def main(
                     channel="chrome",  # Use system Chrome
                     viewport={"width": 1920, "height": 1080},
                     accept_downloads=True,
+                    # ダウンロード先を出力先と同じファイルシステムにし、リネームで保存できるようにする
+                    downloads_path=str(output_path),
                     locale="ja-JP",
                     timezone_id="Asia/Tokyo",
                     args=[
@@ -245,12 +274,14 @@ def main(
                     # Step 2: Export
                     if not login_only:
                         click.echo(f"\n[2/{total_steps}] データをエクスポート中...")
-                        exporter = TaskChuteExporter(download_dir=str(output_path), debug=debug)
                         exported_file = exporter.export_data(
                             page, start_date=start_date, end_date=end_date
                         )
 
                         if not exported_file:
+                            # セッション切れでログイン画面へ飛ばされた可能性があるため、
+                            # 次回はキャッシュを使わずにログイン状態を確認する
+                            login_handler.invalidate_login_cache()
                             click.echo("✗ エクスポート失敗", err=True)
                             sys.exit(1)
 
@@ -276,6 +307,7 @@ def main(
                     output_dir=output_path,
                     enable_ai=not no_ai,
                     model_id=model_id,
+                    feedback_callback=lambda text: click.echo(text, nl=False),
                 )
                 report_path = generator.generate_report()
                 click.echo(f"✓ 分析レポート生成完了: {report_path}")
@@ -1,9 +1,47 @@
 """Playwrightを使用したTaskChute Cloudエクスポート自動化."""
 
-from datetime import date, timedelta
+import errno
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
 
-from playwright.sync_api import Download, Page
+from playwright.sync_api import Download, Locator, Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+logger = logging.getLogger(__name__)
+
+_EXPORT_URL = "https://taskchute.cloud/export/csv-export"
+_DOWNLOAD_BUTTON_SELECTOR = 'button:has-text("ダウンロード")'
+# 日付範囲が確定するとダウンロードボタンが有効になる
+_ENABLED_DOWNLOAD_BUTTON_SELECTOR = f"{_DOWNLOAD_BUTTON_SELECTOR}:enabled"
+_DATE_RANGE_INPUT_SELECTOR = 'input[placeholder*="YYYY"]'
+_YEAR_START_SELECTOR = '[aria-label="年"][data-range-position="start"]'
+_MONTH_START_SELECTOR = '[aria-label="月"][data-range-position="start"]'
+_DAY_START_SELECTOR = '[aria-label="日"][data-range-position="start"]'
+_YEAR_END_SELECTOR = '[aria-label="年"][data-range-position="end"]'
+_MONTH_END_SELECTOR = '[aria-label="月"][data-range-position="end"]'
+_DAY_END_SELECTOR = '[aria-label="日"][data-range-position="end"]'
+# 有効なダウンロードボタンを検索してクリックし、見つかったかどうかを返す
+# (element.click() は無効なボタンでは何もしないため、無効なボタンは対象外とする)
+_CLICK_DOWNLOAD_BUTTON_SCRIPT = """() => {
+    const button = [...document.querySelectorAll("button")].find(
+        (b) => !b.disabled && b.textContent.includes("ダウンロード")
+    );
+    if (!button) return false;
+    button.click();
+    return true;
+}"""
+_DATE_FORM_READY_SELECTOR = f'{_DATE_RANGE_INPUT_SELECTOR}, [aria-label="年"]'
+_EXPORT_BUTTON_SELECTOR = ", ".join(
+    [
+        'button:has-text("エクスポート")',
+        'button:has-text("Export")',
+        'a:has-text("エクスポート")',
+        'a:has-text("Export")',
+    ]
+)
 
 
 class TaskChuteExporter:
@@ -19,6 +57,98 @@ class TaskChuteExporter:
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
         self.debug = debug
+        # フォーム要素のLocatorキャッシュ (ページ遷移時に破棄)
+        self._locator_page: Page | None = None
+        self._locators: dict[str, Locator] = {}
+        # デバッグ用スクリーンショットの書き込みをエクスポート処理から切り離す
+        # (デバッグモードで最初に撮影するときに作成し、export_data の終了時に破棄)
+        self._screenshot_pool: ThreadPoolExecutor | None = None
+
+    def _debug_shot(self, page: Page, name: str, label: str = "スクリーンショット保存") -> None:
+        """デバッグモード時のみ、スクリーンショットをJPEGで保存します。
+
+        撮影のみ同期的に行い、ファイルへの書き込みはバックグラウンドで実行します。
+
+        Args:
+            page: Playwright Pageオブジェクト
+            name: 保存するファイル名
+            label: 保存時に表示するメッセージ
+        """
+        if not self.debug:
+            return
+        screenshot_path = self.download_dir / name
+        data = page.screenshot(type="jpeg", quality=60)
+        if self._screenshot_pool is None:
+            self._screenshot_pool = ThreadPoolExecutor(max_workers=1)
+        self._screenshot_pool.submit(screenshot_path.write_bytes, data)
+        logger.debug("%s: %s", label, screenshot_path)
+
+    def _flush_screenshots(self) -> None:
+        """書き込み待ちのスクリーンショットの保存完了を待ち、スレッドプールを破棄します。"""
+        if self._screenshot_pool is not None:
+            self._screenshot_pool.shutdown(wait=True)
+            self._screenshot_pool = None
+
+    def _locator(self, page: Page, selector: str) -> Locator:
+        """セレクタに一致する最初の要素のLocatorを、ページごとにキャッシュして返します。
+
+        Args:
+            page: Playwright Pageオブジェクト
+            selector: CSSセレクタ
+
+        Returns:
+            セレクタに一致する最初の要素のLocator
+        """
+        if self._locator_page is not page:
+            self._locators.clear()
+            self._locator_page = page
+        locator = self._locators.get(selector)
+        if locator is None:
+            locator = self._locators[selector] = page.locator(selector).first
+        return locator
+
+    def _fill_and_settle(self, field: Locator, value: str, timeout: int = 3000) -> None:
+        """フィールドに値を入力し、フォームが値を受け付けるまで待機します。
+
+        固定時間のスリープの代わりに、要素の値が入力値と一致し、
+        かつ aria-invalid="true" でない状態になるまで待機します
+        (MUIの日付入力は有効なフィールドに aria-invalid="false" を付ける)。
+        待機がタイムアウトした場合は警告を出して入力処理を続行します。
+
+        Args:
+            field: 入力対象のLocator
+            value: 入力する値
+            timeout: 最大待機時間 (ミリ秒)
+        """
+        field.fill(value)
+        try:
+            field.page.wait_for_function(
+                "([el, v]) => el.value === v && el.getAttribute('aria-invalid') !== 'true'",
+                arg=[field.element_handle(), value],
+                timeout=timeout,
+            )
+        except Exception:
+            logger.warning("入力値の反映を確認できませんでした: %s", value)
+
+    def _wait_for_range_committed(self, page: Page, timeout: int = 10000) -> bool:
+        """入力した日付範囲がフォームに確定するまで待機します。
+
+        ページ読み込み済みのため読み込み状態の待機では確定を検出できないので、
+        日付範囲の確定で有効になるダウンロードボタンを待ちます。
+
+        Args:
+            page: Playwright Pageオブジェクト
+            timeout: 最大待機時間 (ミリ秒)
+
+        Returns:
+            ダウンロードボタンが有効になった場合True、タイムアウトした場合False
+        """
+        try:
+            page.wait_for_selector(_ENABLED_DOWNLOAD_BUTTON_SELECTOR, timeout=timeout)
+        except PlaywrightTimeoutError:
+            logger.warning("日付範囲の確定 (ダウンロードボタンの有効化) を確認できませんでした")
+            return False
+        return True
 
     def fill_date_range(self, page: Page, start_date: date, end_date: date) -> bool:
         """日付範囲ピッカーに開始日と終了日を入力します。
@@ -33,87 +163,68 @@ class TaskChuteExporter:
         """
         try:
             # 開始日を入力
-            print(f"開始日を入力中: {start_date}")
+            logger.debug("開始日を入力中: %s", start_date)
 
             # 日付範囲入力フィールドを検索 (YYYY/MM/DD - YYYY/MM/DD 形式)
-            date_input = page.locator('input[placeholder*="YYYY"]').first
+            date_input = self._locator(page, _DATE_RANGE_INPUT_SELECTOR)
             if date_input.count() > 0:
-                print("YYYY プレースホルダーを持つ日付入力フィールドを発見")
+                logger.debug("YYYY プレースホルダーを持つ日付入力フィールドを発見")
                 # フォーマット: YYYY/MM/DD - YYYY/MM/DD
                 date_range_str = (
                     f"{start_date.strftime('%Y/%m/%d')} - {end_date.strftime('%Y/%m/%d')}"
                 )
-                print(f"日付範囲を入力中: {date_range_str}")
+                logger.debug("日付範囲を入力中: %s", date_range_str)
                 date_input.click()
-                page.wait_for_timeout(500)
+                # マスク付きの入力値は入力文字列と一致しない場合があるため、値の一致は待たない
                 date_input.fill(date_range_str)
-                page.wait_for_timeout(500)
                 # Enterキーで確定
                 date_input.press("Enter")
-                page.wait_for_timeout(1000)
-                print("日付範囲を正常に入力しました (単一入力方式)")
+                if not self._wait_for_range_committed(page):
+                    return False
+                logger.debug("日付範囲を正常に入力しました (単一入力方式)")
                 return True
 
             # フォールバック: 個別フィールドでの元の方式を試行
-            print("個別の日付フィールドでの元の方式を試行中...")
+            logger.debug("個別の日付フィールドでの元の方式を試行中...")
 
             # 年 (開始)
-            year_field = page.locator('[aria-label="年"][data-range-position="start"]').first
+            year_field = self._locator(page, _YEAR_START_SELECTOR)
             if year_field.count() == 0:
-                print("data-range-position 属性を持つ年フィールドが見つかりませんでした")
+                logger.warning("data-range-position 属性を持つ年フィールドが見つかりませんでした")
                 return False
 
-            year_field.click()
-            page.wait_for_timeout(200)
-            year_field.fill(str(start_date.year))
-            page.wait_for_timeout(200)
+            self._fill_and_settle(year_field, str(start_date.year))
 
             # 月 (開始)
-            month_field = page.locator('[aria-label="月"][data-range-position="start"]').first
-            month_field.click()
-            page.wait_for_timeout(200)
-            month_field.fill(str(start_date.month))
-            page.wait_for_timeout(200)
+            month_field = self._locator(page, _MONTH_START_SELECTOR)
+            self._fill_and_settle(month_field, str(start_date.month))
 
             # 日 (開始)
-            day_field = page.locator('[aria-label="日"][data-range-position="start"]').first
-            day_field.click()
-            page.wait_for_timeout(200)
-            day_field.fill(str(start_date.day))
-            page.wait_for_timeout(200)
+            day_field = self._locator(page, _DAY_START_SELECTOR)
+            self._fill_and_settle(day_field, str(start_date.day))
 
             # 終了日を入力
-            print(f"終了日を入力中: {end_date}")
+            logger.debug("終了日を入力中: %s", end_date)
 
             # 年 (終了)
-            year_field = page.locator('[aria-label="年"][data-range-position="end"]').first
-            year_field.click()
-            page.wait_for_timeout(200)
-            year_field.fill(str(end_date.year))
-            page.wait_for_timeout(200)
+            year_field = self._locator(page, _YEAR_END_SELECTOR)
+            self._fill_and_settle(year_field, str(end_date.year))
 
             # 月 (終了)
-            month_field = page.locator('[aria-label="月"][data-range-position="end"]').first
-            month_field.click()
-            page.wait_for_timeout(200)
-            month_field.fill(str(end_date.month))
-            page.wait_for_timeout(200)
+            month_field = self._locator(page, _MONTH_END_SELECTOR)
+            self._fill_and_settle(month_field, str(end_date.month))
 
             # 日 (終了)
-            day_field = page.locator('[aria-label="日"][data-range-position="end"]').first
-            day_field.click()
-            page.wait_for_timeout(200)
-            day_field.fill(str(end_date.day))
-            page.wait_for_timeout(500)  # 日付ピッカーが安定するまで待機
+            day_field = self._locator(page, _DAY_END_SELECTOR)
+            self._fill_and_settle(day_field, str(end_date.day))
+            if not self._wait_for_range_committed(page):
+                return False
 
-            print("日付範囲を正常に入力しました (個別フィールド方式)")
+            logger.debug("日付範囲を正常に入力しました (個別フィールド方式)")
             return True
 
         except Exception as e:
-            print(f"日付範囲の入力に失敗しました: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("日付範囲の入力に失敗しました: %s", e)
             return False
 
     def get_expected_filename(self, target_date: date) -> Path:
@@ -125,7 +236,8 @@ class TaskChuteExporter:
         Returns:
             期待されるファイルパス
         """
-        date_str = target_date.strftime("%Y%m%d")
+        # strftimeはロケール処理を伴うため、数値フォーマットで組み立てる
+        date_str = f"{target_date.year:04d}{target_date.month:02d}{target_date.day:02d}"
         filename = f"tasks_{date_str}-{date_str}.csv"
         return self.download_dir / filename
 
@@ -140,7 +252,8 @@ class TaskChuteExporter:
         """
         return self.get_expected_filename(target_date)
 
-    def _parse_filename_date_range(self, filename: str) -> tuple[date | None, date | None]:
+    @staticmethod
+    def _parse_filename_date_range(filename: str) -> tuple[date | None, date | None]:
         """ファイル名から日付範囲を抽出します。
 
         Args:
@@ -185,33 +298,72 @@ class TaskChuteExporter:
         Returns:
             (存在する日付のリスト, 欠けている日付のリスト)のタプル
         """
-        # ダウンロードディレクトリ内の全てのtasks_*.csvファイルをスキャン
-        existing_ranges: list[tuple[date, date]] = []
-        for file_path in self.download_dir.glob("tasks_*.csv"):
-            file_start, file_end = self._parse_filename_date_range(file_path.name)
-            if file_start is not None and file_end is not None:
-                existing_ranges.append((file_start, file_end))
+        return TaskChuteExporter._scan_existing_files(self.download_dir, start_date, end_date)
+
+    @staticmethod
+    def _scan_existing_files(
+        download_dir: Path, start_date: date, end_date: date
+    ) -> tuple[list[date], list[date]]:
+        """ディレクトリを走査し、日付範囲内の既存ファイルをチェックします。
+
+        ディレクトリが存在しない場合は、既存ファイルがないものとして扱います。
+
+        Args:
+            download_dir: 既存ファイルを探すディレクトリ
+            start_date: 開始日
+            end_date: 終了日
+
+        Returns:
+            (存在する日付のリスト, 欠けている日付のリスト)のタプル
+        """
+        # ダウンロードディレクトリを一度だけ走査し、既存ファイルがカバーする日付を集める
+        # (指定範囲外の日付は不要なので範囲内に切り詰める)
+        first, last = start_date.toordinal(), end_date.toordinal()
+        covered: set[int] = set()
+        try:
+            with os.scandir(download_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith("tasks_") and name.endswith(".csv")):
+                        continue
+                    file_start, file_end = TaskChuteExporter._parse_filename_date_range(name)
+                    if file_start is not None and file_end is not None:
+                        lo = max(file_start.toordinal(), first)
+                        hi = min(file_end.toordinal(), last)
+                        covered.update(range(lo, hi + 1))
+        except FileNotFoundError:
+            pass
 
         # 各日付が既存ファイルの範囲でカバーされているかチェック
         existing_dates = []
         missing_dates = []
+        for ordinal in range(first, last + 1):
+            if ordinal in covered:
+                existing_dates.append(date.fromordinal(ordinal))
+            else:
+                missing_dates.append(date.fromordinal(ordinal))
 
-        current_date = start_date
-        while current_date <= end_date:
-            # この日付が既存ファイルのいずれかの範囲に含まれているかチェック
-            is_covered = False
-            for range_start, range_end in existing_ranges:
-                if range_start <= current_date <= range_end:
-                    existing_dates.append(current_date)
-                    is_covered = True
-                    break
+        return existing_dates, missing_dates
 
-            if not is_covered:
-                missing_dates.append(current_date)
+    @staticmethod
+    def plan_export(
+        download_dir: str | Path, start_date: date, end_date: date
+    ) -> list[tuple[date, date]]:
+        """ブラウザを起動せず、エクスポーターも作成せずに、エクスポートが必要な日付範囲を求めます。
 
-            current_date += timedelta(days=1)
+        Args:
+            download_dir: 既存ファイルを探すディレクトリ
+            start_date: 開始日
+            end_date: 終了日
 
-        return existing_dates, missing_dates
+        Returns:
+            既存ファイルでカバーされていない連続した日付範囲のリスト。
+            空の場合はエクスポート不要
+        """
+        _, missing_dates = TaskChuteExporter._scan_existing_files(
+            Path(download_dir), start_date, end_date
+        )
+        return TaskChuteExporter._group_consecutive_dates(missing_dates, assume_sorted=True)
 
     def _check_existing_files(
         self, start_date: date, end_date: date
@@ -227,11 +379,16 @@ class TaskChuteExporter:
         """
         return self.check_existing_files(start_date, end_date)
 
-    def _group_consecutive_dates(self, dates: list[date]) -> list[tuple[date, date]]:
+    @staticmethod
+    def _group_consecutive_dates(
+        dates: list[date], assume_sorted: bool = False
+    ) -> list[tuple[date, date]]:
         """日付リストを連続する範囲にグループ化します。
 
         Args:
-            dates: 日付のリスト（ソート済みである必要があります）
+            dates: 日付のリスト
+            assume_sorted: Trueの場合、datesが重複のない昇順であるとみなしソートを省略する
+                (check_existing_files の戻り値はこの条件を満たす)
 
         Returns:
             連続する日付範囲のリスト [(start_date, end_date), ...]
@@ -239,108 +396,116 @@ class TaskChuteExporter:
         if not dates:
             return []
 
-        dates_sorted = sorted(dates)
-        ranges = []
-        range_start = dates_sorted[0]
-        range_end = dates_sorted[0]
-
-        for i in range(1, len(dates_sorted)):
-            if dates_sorted[i] == range_end + timedelta(days=1):
-                # 連続している
-                range_end = dates_sorted[i]
-            else:
-                # 連続が途切れた
-                ranges.append((range_start, range_end))
-                range_start = dates_sorted[i]
-                range_end = dates_sorted[i]
-
-        # 最後の範囲を追加
-        ranges.append((range_start, range_end))
+        # 序数 (int) に変換し、差分が1でない位置を範囲の区切りとする
+        if assume_sorted:
+            ords = [d.toordinal() for d in dates]
+        else:
+            ords = sorted({d.toordinal() for d in dates})
+        breaks = [i for i in range(1, len(ords)) if ords[i] - ords[i - 1] != 1]
+        starts = [0, *breaks]
+        ends = [*(i - 1 for i in breaks), len(ords) - 1]
+
+        ranges = [
+            (date.fromordinal(ords[s]), date.fromordinal(ords[e]))
+            for s, e in zip(starts, ends, strict=True)
+        ]
 
         return ranges
 
-    def _export_date_range(
-        self, page: Page, start_date: date, end_date: date
-    ) -> str | None:
-        """指定された日付範囲のデータをエクスポートします（内部実装）。
+    def _prepare_export_page(self, page: Page) -> None:
+        """エクスポートページへ移動し、日付入力フォームの表示を待機します。
 
         Args:
             page: Playwright Pageオブジェクト
-            start_date: エクスポートの開始日
-            end_date: エクスポートの終了日
-
-        Returns:
-            ダウンロードしたファイルのパス、またはエクスポート失敗時はNone
         """
-        # エクスポートページへ移動
-        export_url = "https://taskchute.cloud/export/csv-export"
-        print(f"{export_url} へ移動中")
-        page.goto(export_url, timeout=30000)
+        # ページ遷移でフォームが再マウントされるため、Locatorキャッシュを破棄
+        self._locators.clear()
 
-        # ページが安定した状態になるまで待機
-        print("ページの読み込みを待機中...")
-        page.wait_for_load_state("load", timeout=30000)
+        # エクスポートページへ移動 (レスポンス受信時点で戻り、以降はフォームの表示を待つ)
+        logger.info("%s へ移動中", _EXPORT_URL)
+        page.goto(_EXPORT_URL, wait_until="commit", timeout=30000)
 
         # 日付入力フィールドが表示されるまで待機 (Reactアプリのレンダリング完了を確認)
-        print("日付入力フィールドの表示を待機中...")
-        try:
-            page.wait_for_selector('input[placeholder*="YYYY"]', timeout=10000, state="visible")
-        except Exception:
-            # フォールバック: 個別フィールドを待機
-            page.wait_for_selector('[aria-label="年"]', timeout=10000, state="visible")
+        # 単一入力・個別フィールドのどちらの形式でも一度の待機で検出する
+        logger.debug("日付入力フィールドの表示を待機中...")
+        page.wait_for_selector(_DATE_FORM_READY_SELECTOR, timeout=30000, state="visible")
 
         # ページ読み込み後のスクリーンショットを撮影 (デバッグモードのみ)
-        if self.debug:
-            screenshot_path = self.download_dir / "debug_page_loaded.png"
-            page.screenshot(path=str(screenshot_path))
-            print(f"スクリーンショット保存: {screenshot_path}")
+        self._debug_shot(page, "debug_page_loaded.jpg")
 
+    def _download_for_range(self, page: Page, start_date: date, end_date: date) -> str | None:
+        """表示済みのエクスポートページで日付範囲を入力し、CSVをダウンロードします。
+
+        Args:
+            page: Playwright Pageオブジェクト (エクスポートページ表示済み)
+            start_date: エクスポートの開始日
+            end_date: エクスポートの終了日
+
+        Returns:
+            ダウンロードしたファイルのパス、またはエクスポート失敗時はNone
+        """
         # 日付範囲を入力
         if not self.fill_date_range(page, start_date, end_date):
-            print("日付範囲の入力に失敗しました")
-            if self.debug:
-                screenshot_path = self.download_dir / "debug_fill_date_failed.png"
-                page.screenshot(path=str(screenshot_path))
-                print(f"エラースクリーンショット保存: {screenshot_path}")
+            logger.error("日付範囲の入力に失敗しました")
+            self._debug_shot(
+                page, "debug_fill_date_failed.jpg", label="エラースクリーンショット保存"
+            )
             return None
 
         # 日付入力後のスクリーンショットを撮影 (デバッグモードのみ)
-        if self.debug:
-            screenshot_path = self.download_dir / "debug_dates_filled.png"
-            page.screenshot(path=str(screenshot_path))
-            print(f"スクリーンショット保存: {screenshot_path}")
-
-        # ダウンロードボタンを検索
-        download_button = page.locator('button:has-text("ダウンロード")')
-        button_count = download_button.count()
-        print(f"ダウンロードボタンを {button_count} 個発見")
-
-        if button_count == 0:
-            print("ダウンロードボタンが見つかりませんでした")
-            if self.debug:
-                screenshot_path = self.download_dir / "debug_no_download_button.png"
-                page.screenshot(path=str(screenshot_path))
-                print(f"エラースクリーンショット保存: {screenshot_path}")
-            return None
-
-        # ダウンロードハンドラを設定してボタンをクリック
-        download_path = None
+        self._debug_shot(page, "debug_dates_filled.jpg")
 
-        with page.expect_download(timeout=30000) as download_info:
-            print("ダウンロードボタンをクリック中...")
-            download_button.click()
+        # ダウンロードボタンの検索とクリックを1回のevaluateで行う
+        try:
+            with page.expect_download(timeout=30000) as download_info:
+                logger.debug("ダウンロードボタンをクリック中...")
+                if not page.evaluate(_CLICK_DOWNLOAD_BUTTON_SCRIPT):
+                    # ダウンロード待機を打ち切るため例外で抜ける
+                    raise LookupError("download button not found")
+        except LookupError:
+            logger.error("有効なダウンロードボタンが見つかりませんでした")
+            self._debug_shot(
+                page, "debug_no_download_button.jpg", label="エラースクリーンショット保存"
+            )
+            return None
 
         # ダウンロードオブジェクトを取得
         download: Download = download_info.value
 
-        # ファイルを保存
+        # ファイルを保存 (同一ファイルシステム上ならコピーせずリネームで移動)
         filename = download.suggested_filename
         download_path = self.download_dir / filename
-        download.save_as(download_path)
-
-        print(f"ファイルのダウンロードに成功: {download_path}")
+        try:
+            os.replace(download.path(), download_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            download.save_as(download_path)
+
+        # 次の範囲で再利用できるよう、日付入力をクリア
+        date_input = self._locator(page, _DATE_RANGE_INPUT_SELECTOR)
+        if date_input.count() > 0:
+            date_input.evaluate(
+                "el => { el.value = ''; el.dispatchEvent(new Event('input', {bubbles: true})) }"
+            )
+
+        logger.info("ファイルのダウンロードに成功: %s", download_path)
         return str(download_path)
 
+    def _export_date_range(self, page: Page, start_date: date, end_date: date) -> str | None:
+        """指定された日付範囲のデータをエクスポートします（内部実装）。
+
+        Args:
+            page: Playwright Pageオブジェクト
+            start_date: エクスポートの開始日
+            end_date: エクスポートの終了日
+
+        Returns:
+            ダウンロードしたファイルのパス、またはエクスポート失敗時はNone
+        """
+        self._prepare_export_page(page)
+        return self._download_for_range(page, start_date, end_date)
+
     def export_data(
         self, page: Page, start_date: date | None = None, end_date: date | None = None
     ) -> str | None:
@@ -358,13 +523,11 @@ class TaskChuteExporter:
             ダウンロードしたファイルのパス、またはエクスポート失敗時はNone
         """
         try:
-            # 指定されていない場合はデフォルト日付を計算
-            from datetime import date as date_class
-
-            if start_date is None:
-                start_date = date_class.today() - timedelta(days=1)
-            if end_date is None:
-                end_date = date_class.today() - timedelta(days=1)
+            # 指定されていない場合はデフォルト日付 (昨日) を計算
+            if start_date is None or end_date is None:
+                yesterday = date.fromordinal(date.today().toordinal() - 1)
+                start_date = start_date or yesterday
+                end_date = end_date or yesterday
 
             # 既存ファイルをチェック
             existing_dates, missing_dates = self.check_existing_files(start_date, end_date)
@@ -373,47 +536,59 @@ class TaskChuteExporter:
             if not missing_dates:
                 if existing_dates:
                     first_existing_file = self._get_expected_filename(existing_dates[0])
-                    print(
-                        f"全ての日付のファイルが既に存在します ({start_date} 〜 {end_date})。"
-                        f"スキップします: {first_existing_file}"
+                    logger.info(
+                        "全ての日付のファイルが既に存在します (%s 〜 %s)。スキップします: %s",
+                        start_date,
+                        end_date,
+                        first_existing_file,
                     )
                     return str(first_existing_file)
                 else:
                     # 日付範囲が空の場合（通常は発生しない）
-                    print("日付範囲が空です")
+                    logger.warning("日付範囲が空です")
                     return None
 
             # 一部または全ての日付のファイルが欠けている場合
             if existing_dates:
-                print(
-                    f"既存ファイルが見つかりました ({len(existing_dates)} 日分)。"
-                    f"欠けている日付のみをエクスポートします ({len(missing_dates)} 日分)"
+                logger.info(
+                    "既存ファイルが見つかりました (%d 日分)。"
+                    "欠けている日付のみをエクスポートします (%d 日分)",
+                    len(existing_dates),
+                    len(missing_dates),
                 )
 
             # 欠けている日付を連続する範囲にグループ化
-            missing_ranges = self._group_consecutive_dates(missing_dates)
+            missing_ranges = self._group_consecutive_dates(missing_dates, assume_sorted=True)
+
+            # エクスポートページへの移動は一度だけ行い、各範囲でフォームを再利用
+            # NOTE: sync APIのPageは生成したスレッドからしか操作できないため、
+            # 範囲ごとのダウンロードは直列に実行する (並列化より再利用を優先)
+            self._prepare_export_page(page)
 
             # 各範囲に対してエクスポート処理を実行
             exported_files = []
-            for range_start, range_end in missing_ranges:
+            for i, (range_start, range_end) in enumerate(missing_ranges):
                 if range_start == range_end:
-                    print(f"エクスポート中: {range_start}")
+                    logger.info("エクスポート中: %s", range_start)
                 else:
-                    print(f"エクスポート中: {range_start} 〜 {range_end}")
+                    logger.info("エクスポート中: %s 〜 %s", range_start, range_end)
+
+                # 再利用したページでフォームが失われている場合のみ再読み込み
+                if i > 0 and page.locator(_DOWNLOAD_BUTTON_SELECTOR).count() == 0:
+                    self._prepare_export_page(page)
 
-                exported_file = self._export_date_range(page, range_start, range_end)
+                exported_file = self._download_for_range(page, range_start, range_end)
                 if exported_file:
                     exported_files.append(exported_file)
                 else:
-                    print(f"エクスポート失敗: {range_start} 〜 {range_end}")
+                    logger.error("エクスポート失敗: %s 〜 %s", range_start, range_end)
                     # エラー時のスクリーンショットを撮影 (デバッグモードのみ)
-                    if self.debug:
-                        try:
-                            screenshot_path = self.download_dir / "debug_error.png"
-                            page.screenshot(path=str(screenshot_path))
-                            print(f"エラースクリーンショット保存: {screenshot_path}")
-                        except Exception as screenshot_error:
-                            print(f"エラースクリーンショットの撮影に失敗: {screenshot_error}")
+                    try:
+                        self._debug_shot(
+                            page, "debug_error.jpg", label="エラースクリーンショット保存"
+                        )
+                    except Exception as screenshot_error:
+                        logger.warning("エラースクリーンショットの撮影に失敗: %s", screenshot_error)
                     # 一部のエクスポートが失敗した場合でも、成功したファイルがあれば返す
                     if not exported_files:
                         return None
@@ -425,16 +600,15 @@ class TaskChuteExporter:
                 return None
 
         except Exception as e:
-            print(f"エクスポートがエラーで失敗しました: {e}")
+            logger.error("エクスポートがエラーで失敗しました: %s", e)
             # エラー時のスクリーンショットを撮影 (デバッグモードのみ)
-            if self.debug:
-                try:
-                    screenshot_path = self.download_dir / "debug_error.png"
-                    page.screenshot(path=str(screenshot_path))
-                    print(f"エラースクリーンショット保存: {screenshot_path}")
-                except Exception as screenshot_error:
-                    print(f"エラースクリーンショットの撮影に失敗: {screenshot_error}")
+            try:
+                self._debug_shot(page, "debug_error.jpg", label="エラースクリーンショット保存")
+            except Exception as screenshot_error:
+                logger.warning("エラースクリーンショットの撮影に失敗: %s", screenshot_error)
             return None
+        finally:
+            self._flush_screenshots()
 
     def wait_for_export_button(self, page: Page, timeout: int = 10000) -> bool:
         """エクスポートボタンが利用可能になるまで待機します。
@@ -446,18 +620,9 @@ class TaskChuteExporter:
         Returns:
             ボタンが見つかった場合True、見つからない場合False
         """
-        export_button_selectors = [
-            'button:has-text("エクスポート")',
-            'button:has-text("Export")',
-            'a:has-text("エクスポート")',
-            'a:has-text("Export")',
-        ]
-
-        for selector in export_button_selectors:
-            try:
-                page.wait_for_selector(selector, timeout=timeout)
-                return True
-            except Exception:
-                continue
-
-        return False
+        # 複数の候補をカンマ区切りの複合セレクタにまとめ、一度の待機で検索
+        try:
+            page.wait_for_selector(_EXPORT_BUTTON_SELECTOR, timeout=timeout)
+            return True
+        except Exception:
+            return False
@@ -1,24 +1,81 @@
 """TaskChute Cloud ログインチェッカー (永続的プロファイル用)."""
 
+import logging
 import os
 import time
+from pathlib import Path
+from urllib.parse import urlsplit
 
-from playwright.sync_api import Page
+from playwright.sync_api import Frame, Page
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# ログイン状態キャッシュの有効期間 (秒)
+_LOGIN_CACHE_TTL_SEC = 3600
+# 未ログイン時に表示されるログインボタン
+_LOGIN_BUTTON_SELECTOR = 'button:has-text("LOGIN WITH")'
+# 手動ログイン待機中に進捗を表示し、ログイン状態を再確認する間隔 (ミリ秒)
+_MANUAL_LOGIN_CHECK_INTERVAL_MS = 30_000
+
+
+def _is_app_url(url: str) -> bool:
+    """URLがTaskChute Cloudのアプリ画面 (認証画面以外) かどうかを返します。
+
+    ホスト名 (//taskchute.cloud) に一致しないよう、パス部分で判定します。
+    """
+    return urlsplit(url).path.startswith("/taskchute") and "/auth/" not in url
 
 
 class TaskChuteLogin:
     """永続的プロファイルを使用した場合のTaskChute Cloudへのログイン状態をチェックします。"""
 
-    def __init__(self, google_email: str, google_password: str):
+    def __init__(self, google_email: str, google_password: str, state_dir: Path | None = None):
         """Google認証情報で初期化 (後方互換性のため保持)。
 
         Args:
             google_email: Googleアカウントのメールアドレス (永続的プロファイルでは未使用)
             google_password: Googleアカウントのパスワード (永続的プロファイルでは未使用)
+            state_dir: ログイン状態キャッシュの保存先。Noneの場合はキャッシュしない
         """
         self.google_email = google_email
         self.google_password = google_password
         self.base_url = "https://taskchute.cloud"
+        self._cache_path = state_dir / "login_ok.ts" if state_dir is not None else None
+
+    def _is_login_cache_fresh(self) -> bool:
+        """直近のログイン確認結果がキャッシュ有効期間内かどうかを返します。"""
+        if self._cache_path is None:
+            return False
+        try:
+            mtime = self._cache_path.stat().st_mtime
+        except OSError:
+            return False
+        return time.time() - mtime < _LOGIN_CACHE_TTL_SEC
+
+    def _update_login_cache(self, logged_in: bool) -> None:
+        """ログイン確認結果をキャッシュに反映します。
+
+        Args:
+            logged_in: ログイン済みの場合True
+        """
+        if self._cache_path is None:
+            return
+        try:
+            if logged_in:
+                self._cache_path.touch()
+            else:
+                self._cache_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def invalidate_login_cache(self) -> None:
+        """ログイン状態キャッシュを破棄し、次回の login() で実際の確認を行わせます。
+
+        キャッシュ有効期間内にサーバー側のセッションが切れ、エクスポートページが
+        ログイン画面へリダイレクトされた場合などに呼び出します。
+        """
+        self._update_login_cache(False)
 
     def login(
         self, page: Page, wait_for_manual_login: bool = False, manual_timeout_sec: int | None = None
@@ -37,6 +94,11 @@ class TaskChuteLogin:
         Returns:
             ログインに成功した場合True、失敗した場合False
         """
+        # 直近にログイン済みを確認している場合は、ページ遷移を省略
+        if not wait_for_manual_login and self._is_login_cache_fresh():
+            print("✓ ログイン済みです (キャッシュ)")
+            return True
+
         try:
             # TaskChute Cloudへ移動
             print("TaskChute Cloud にアクセス中...")
@@ -46,9 +108,6 @@ class TaskChuteLogin:
             # wait_for_manual_login=Trueの場合、最初のチェックをスキップして
             # 直接手動ログイン待機ループに入る（ユーザーが手動でログインするため）
             if wait_for_manual_login:
-                # ページのリダイレクトが完了するまで少し待機
-                page.wait_for_timeout(2000)
-
                 print("\nブラウザで手動でログインしてください:")
                 print("1. ブラウザでログインボタンをクリック")
                 print("2. Googleログイン、Appleログイン、E-mailログインのいずれかでログイン")
@@ -59,25 +118,10 @@ class TaskChuteLogin:
 
                 # 手動ログイン待機
                 timeout = manual_timeout_sec if manual_timeout_sec is not None else 300
-                start_time = time.time()
-
-                while time.time() - start_time < timeout:
-                    # 2秒ごとにログイン状態をチェック
-                    page.wait_for_timeout(2000)
-
-                    # ログイン状態を再確認
-                    if self._is_logged_in(page):
-                        print("\n✓ ログイン完了を検出しました！")
-                        return True
-
-                    # 進捗表示（30秒ごと）
-                    elapsed = int(time.time() - start_time)
-                    if elapsed > 0 and elapsed % 30 == 0:
-                        remaining = timeout - elapsed
-                        print(f"待機中... (残り約{remaining}秒)")
-                        # 観測性向上のため、URLとタイトルも表示
-                        print(f"  現在のURL: {page.url}")
-                        print(f"  ページタイトル: {page.title()}")
+                if self._wait_for_manual_login(page, timeout):
+                    print("\n✓ ログイン完了を検出しました！")
+                    self._update_login_cache(True)
+                    return True
 
                 print(f"\nタイムアウト: {timeout}秒以内にログインが検出されませんでした")
                 return False
@@ -85,8 +129,10 @@ class TaskChuteLogin:
                 # 通常モード: ログイン状態を確認
                 if self._is_logged_in(page):
                     print("✓ ログイン済みです")
+                    self._update_login_cache(True)
                     return True
                 else:
+                    self._update_login_cache(False)
                     print("\n✗ ログインが必要です")
                     print("初回実行時は --login-only --debug オプションを使用して")
                     print("ブラウザでTaskChute Cloudにログインしてください。")
@@ -95,12 +141,54 @@ class TaskChuteLogin:
                     return False
 
         except Exception as e:
-            print(f"エラー: {e}")
-            import traceback
-
-            traceback.print_exc()
+            logger.exception("エラー: %s", e)
             return False
 
+    def _wait_for_manual_login(self, page: Page, timeout: int) -> bool:
+        """ページ遷移とログインボタンの消失を待ち受け、手動ログインの完了を検出します。
+
+        ポーリングの代わりに、URLがアプリ画面に遷移するまで待機します。
+        遷移後もログインボタンが表示されている場合は、ボタンが消えるまで待ちます
+        (ページ遷移を伴わないクライアント側のログイン完了も検出するため)。
+        いずれの待機も一定間隔で区切り、残り時間を表示してから再確認します。
+
+        Args:
+            page: Playwright Pageオブジェクト
+            timeout: 最大待機時間 (秒)
+
+        Returns:
+            タイムアウト前にログインを検出した場合True、それ以外はFalse
+        """
+
+        def on_navigated(frame: Frame) -> None:
+            if frame == page.main_frame:
+                logger.debug("現在のURL: %s", frame.url)
+
+        # 壁時計の変更に影響されないよう、経過時間は単調時計で測る
+        deadline = time.monotonic() + timeout
+        page.on("framenavigated", on_navigated)
+        try:
+            while (remaining_ms := (deadline - time.monotonic()) * 1000) > 0:
+                step_ms = min(remaining_ms, _MANUAL_LOGIN_CHECK_INTERVAL_MS)
+                try:
+                    page.wait_for_url(_is_app_url, timeout=step_ms)
+                    if self._is_logged_in(page):
+                        return True
+                    # URLは条件を満たすがログインボタンが表示中: ボタンが消えるまで待つ
+                    page.wait_for_selector(
+                        _LOGIN_BUTTON_SELECTOR, state="detached", timeout=step_ms
+                    )
+                except PlaywrightTimeoutError:
+                    remaining_sec = int(deadline - time.monotonic())
+                    if remaining_sec > 0:
+                        print(f"待機中... (残り約{remaining_sec}秒)")
+                        # 観測性向上のため、URLとタイトルも表示
+                        print(f"  現在のURL: {page.url}")
+                        print(f"  ページタイトル: {page.title()}")
+        finally:
+            page.remove_listener("framenavigated", on_navigated)
+        return False
+
     def _is_logged_in(self, page: Page) -> bool:
         """TaskChute Cloudにログイン済みかどうかをチェックします。
 
@@ -118,21 +206,18 @@ class TaskChuteLogin:
 
         # ログインボタンが表示されている場合、未ログイン
         try:
-            page.wait_for_selector('button:has-text("LOGIN WITH")', timeout=2000)
+            page.wait_for_selector(_LOGIN_BUTTON_SELECTOR, timeout=2000)
             return False  # ログインボタンが見つかった、未ログイン
         except Exception:
             # ログインボタンが見つからない場合、さらに確認
             pass
 
         # /taskchute にいて /auth/ にいない場合、ログイン済み
-        if "/taskchute" in current_url and "/auth/" not in current_url:
-            return True
-
         # その他の場合は未ログインと判定（保守的）
-        return False
+        return _is_app_url(current_url)
 
 
-def create_login_from_env() -> TaskChuteLogin:
+def create_login_from_env(state_dir: Path | None = None) -> TaskChuteLogin:
     """環境変数からTaskChuteLoginインスタンスを作成します。
 
     期待する環境変数:
@@ -146,6 +231,9 @@ def create_login_from_env() -> TaskChuteLogin:
     注意: 永続的プロファイルを使用する場合、認証情報は参照用のみです。
           実際の認証はブラウザで手動で行われます。
 
+    Args:
+        state_dir: ログイン状態キャッシュの保存先。Noneの場合はキャッシュしない
+
     Returns:
         TaskChuteLoginインスタンス
     """
@@ -165,4 +253,4 @@ def create_login_from_env() -> TaskChuteLogin:
     if not google_password:
         google_password = "manual-login"
 
-    return TaskChuteLogin(google_email, google_password)
+    return TaskChuteLogin(google_email, google_password, state_dir=state_dir)
@@ -1,6 +1,7 @@
 """Markdownレポート生成モジュール."""
 
 import logging
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 
@@ -24,6 +25,7 @@ class ReportGenerator:
         output_dir: Path,
         enable_ai: bool = True,
         model_id: str = "us.anthropic.claude-sonnet-4-5-20250929-v1:0",
+        feedback_callback: Callable[[str], None] | None = None,
     ):
         """ReportGeneratorを初期化する.
 
@@ -32,11 +34,13 @@ class ReportGenerator:
             output_dir: レポート出力先ディレクトリ
             enable_ai: AI分析を有効にするかどうか
             model_id: 使用するBedrockのモデルIDまたは推論プロファイルID
+            feedback_callback: AIフィードバックのテキストを受信するたびに呼び出されるコールバック
         """
         self.csv_path = csv_path
         self.output_dir = output_dir
         self.enable_ai = enable_ai
         self.model_id = model_id
+        self.feedback_callback = feedback_callback
         self.data = pd.read_csv(csv_path)
         self.analyzers: list[IAnalyzer] = []
 
@@ -131,7 +135,11 @@ class ReportGenerator:
                     data=self.data,
                     start_date=start_date,
                     end_date=end_date,
+                    on_chunk=self.feedback_callback,
                 )
+                if self.feedback_callback is not None:
+                    # ストリーミング出力の後に改行する
+                    self.feedback_callback("\n")
             except Exception as e:
                 logger.warning("AI分析をスキップします: %s", e)
                 ai_feedback = "> AI分析は利用できません。AWS認証情報を確認してください。"
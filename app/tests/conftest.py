@@ -1,10 +1,71 @@
 """共通テストフィクスチャとユーティリティ."""
 
+import os
+import shutil
+import tempfile
 from collections.abc import Generator
 from pathlib import Path
 from unittest.mock import MagicMock, Mock
 
 import pytest
+from playwright.sync_api import Download, Locator, Page
+
+_RAMDISK_ROOT = Path("/dev/shm")
+# pytest_configure で作成した basetemp (終了時に削除する)
+_RAMDISK_BASETEMP = pytest.StashKey[Path]()
+
+# モックの spec_set に渡す属性名の一覧 (dir() の走査を一度だけで済ませる)
+_PAGE_SPEC = dir(Page)
+_LOCATOR_SPEC = dir(Locator)
+_DOWNLOAD_SPEC = dir(Download)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    """一時ディレクトリをメモリ上のファイルシステムに配置します。
+
+    --basetemp が指定されていない場合のみ、環境変数 PYTEST_RAMDISK、
+    または書き込み可能な /dev/shm の下に実行ごとの一意なディレクトリを作成し、
+    tmp_path 等の基準ディレクトリにします。pytest は basetemp を起動時に
+    削除するため、既存のディレクトリをそのまま渡してはいけません。
+
+    Args:
+        config: pytestの設定オブジェクト
+    """
+    if config.option.basetemp:
+        return
+    root = os.environ.get("PYTEST_RAMDISK")
+    if root is None:
+        if not (_RAMDISK_ROOT.is_dir() and os.access(_RAMDISK_ROOT, os.W_OK)):
+            return
+        root = str(_RAMDISK_ROOT)
+    try:
+        basetemp = Path(tempfile.mkdtemp(prefix="pytest-", dir=root))
+    except OSError:
+        return
+    config.stash[_RAMDISK_BASETEMP] = basetemp
+    config.option.basetemp = str(basetemp)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """pytest_configure で作成したメモリ上の一時ディレクトリを削除します。
+
+    Args:
+        config: pytestの設定オブジェクト
+    """
+    basetemp = config.stash.get(_RAMDISK_BASETEMP, None)
+    if basetemp is not None:
+        shutil.rmtree(basetemp, ignore_errors=True)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _stub_dotenv() -> Generator[None, None, None]:
+    """テスト中に.envファイルを読み込まないよう、CLIのload_dotenvを無効化します。"""
+    from tccretro import cli
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(cli, "load_dotenv", lambda *args, **kwargs: None)
+        yield
 
 
 @pytest.fixture
@@ -14,18 +75,10 @@ def mock_page() -> Mock:
     Returns:
         モックされたPageオブジェクト
     """
-    page = MagicMock()
+    # goto や locator などの子モックは、アクセスされた時点で遅延生成される
+    page = MagicMock(spec_set=_PAGE_SPEC)
     page.url = "https://taskchute.cloud/taskchute"
-    page.goto = MagicMock()
-    page.wait_for_load_state = MagicMock()
-    page.wait_for_selector = MagicMock()
-    page.wait_for_timeout = MagicMock()
-    page.locator = MagicMock()
-    page.click = MagicMock()
-    page.fill = MagicMock()
-    page.press = MagicMock()
-    page.screenshot = MagicMock()
-    page.expect_download = MagicMock()
+    page.screenshot.return_value = b""
     return page
 
 
@@ -36,57 +89,60 @@ def mock_locator() -> Mock:
     Returns:
         モックされたLocatorオブジェクト
     """
-    locator = MagicMock()
-    locator.count = MagicMock(return_value=1)
+    locator = MagicMock(spec_set=_LOCATOR_SPEC)
+    locator.count.return_value = 1
     locator.first = locator
-    locator.click = MagicMock()
-    locator.fill = MagicMock()
-    locator.press = MagicMock()
     return locator
 
 
 @pytest.fixture
-def mock_download() -> Mock:
+def mock_download(tmp_path_factory: pytest.TempPathFactory) -> Mock:
     """Playwright Downloadオブジェクトのモックを作成します。
 
+    Args:
+        tmp_path_factory: pytestの一時ディレクトリファクトリ
+
     Returns:
         モックされたDownloadオブジェクト
     """
-    download = MagicMock()
+    # Playwrightが保存するダウンロード済みの一時ファイルを模擬
+    downloaded = tmp_path_factory.mktemp("artifacts") / "download-artifact"
+    downloaded.write_text("タイムライン日付\n", encoding="utf-8")
+
+    download = MagicMock(spec_set=_DOWNLOAD_SPEC)
     download.suggested_filename = "test_export.csv"
-    download.save_as = MagicMock()
+    download.path.return_value = downloaded
     return download
 
 
 @pytest.fixture
-def temp_download_dir(tmp_path: Path) -> Generator[Path, None, None]:
+def temp_download_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """一時的なダウンロードディレクトリを作成します。
 
+    セッションの基準ディレクトリ直下に連番付きディレクトリを1回のmkdirで作成します。
+    削除はpytestがセッション単位でまとめて行うため、テストごとの後処理はありません。
+
     Args:
-        tmp_path: pytestのtmp_pathフィクスチャ
+        tmp_path_factory: pytestの一時ディレクトリファクトリ
 
-    Yields:
+    Returns:
         一時ダウンロードディレクトリのパス
     """
-    download_dir = tmp_path / "downloads"
-    download_dir.mkdir(parents=True, exist_ok=True)
-    yield download_dir
+    return tmp_path_factory.mktemp("downloads")
 
 
 @pytest.fixture
-def mock_env(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
-    """環境変数のモックを設定します。
+def clean_env(monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+    """TASKCHUTE_ で始まる環境変数を除いた辞書で os.environ を差し替えます。
+
+    キーごとに setenv/delenv する代わりに、辞書ごと差し替えて一括で元に戻します。
 
     Args:
         monkeypatch: pytestのmonkeypatchフィクスチャ
 
     Returns:
-        設定された環境変数の辞書
+        差し替え後の環境変数の辞書 (テストから直接書き換え可能)
     """
-    env_vars = {
-        "TASKCHUTE_GOOGLE_EMAIL": "test@example.com",
-        "TASKCHUTE_GOOGLE_PASSWORD": "test_password",
-    }
-    for key, value in env_vars.items():
-        monkeypatch.setenv(key, value)
-    return env_vars
+    env = {key: value for key, value in os.environ.items() if not key.startswith("TASKCHUTE_")}
+    monkeypatch.setattr(os, "environ", env)
+    return env
@@ -1,11 +1,15 @@
 """AIFeedbackGeneratorモジュールのテスト."""
 
 import tempfile
+from datetime import date
 from pathlib import Path
+from unittest.mock import MagicMock, Mock, call
 
+import jpholiday
 import pandas as pd
 import pytest
 
+from tccretro import ai_feedback
 from tccretro.ai_feedback import AIFeedbackGenerator
 
 
@@ -108,6 +112,40 @@ class TestAIFeedbackGenerator:
         assert "日曜日" in holiday_info
         assert "文化の日" in holiday_info
 
+    def test_休日判定が日付単位でキャッシュされる(self, monkeypatch):
+        """祝日は未判定の範囲でまとめて取得し、重複する期間では判定結果が再利用されることを確認."""
+        monkeypatch.setattr(ai_feedback, "_day_descriptions", {})
+        between = Mock(wraps=jpholiday.between)
+        monkeypatch.setattr(jpholiday, "between", between)
+        generator = AIFeedbackGenerator()
+
+        generator._get_holiday_info("2025-11-01", "2025-11-03")
+        generator._get_holiday_info("2025-11-03", "2025-11-03")
+        holiday_info = generator._get_holiday_info("2025-11-02", "2025-11-05")
+
+        assert between.call_args_list == [
+            call(date(2025, 11, 1), date(2025, 11, 3)),
+            call(date(2025, 11, 4), date(2025, 11, 5)),
+        ]
+        assert "文化の日" in holiday_info
+
+    def test_休日情報の曜日名が正しい(self):
+        """1週間分の曜日名が日付と正しく対応することを確認（ロケールに依存しない）."""
+        generator = AIFeedbackGenerator()
+        # 2025-11-10（月）〜 2025-11-16（日）
+        holiday_info = generator._get_holiday_info("2025-11-10", "2025-11-16")
+
+        lines = holiday_info.strip().split("\n")
+        assert [line.split(" ")[1] for line in lines] == [
+            "(月曜日):",
+            "(火曜日):",
+            "(水曜日):",
+            "(木曜日):",
+            "(金曜日):",
+            "(土曜日):",
+            "(日曜日):",
+        ]
+
     def test_プロンプトに日付情報が含まれる(self, sample_dataframe):
         """プロンプトに日付情報が含まれることを確認."""
         generator = AIFeedbackGenerator()
@@ -152,6 +190,18 @@ class TestAIFeedbackGenerator:
         assert "分析対象日" not in prompt
         assert "生データサンプル" not in prompt
 
+    def test_プロンプトにDataFrame以外のデータの場合_CSVサンプルが含まれない(self):
+        """empty属性を持たない入力でも、CSVサンプル抽出と同じ基準で扱われることを確認."""
+        generator = AIFeedbackGenerator()
+        prompt = generator._build_prompt(
+            project_summary={"total_projects": 2},
+            mode_summary={"total_modes": 2},
+            routine_summary={"total_hours": 2.25},
+            data=[{"タスク名": "タスク1"}],
+        )
+
+        assert "生データサンプル" not in prompt
+
     def test_プロンプトテンプレートファイルが存在する場合_読み込まれる(self, sample_dataframe):
         """テンプレートファイルが存在する場合、そのファイルから読み込まれることを確認."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -239,6 +289,112 @@ CSV: {csv_sample_section}
             assert '"total_projects": 2' in prompt
             assert '"total_modes": 2' in prompt
 
+    def test_プロジェクト定義がキャッシュされ_更新時に再読み込みされる(self, tmp_path):
+        """同一ファイルはキャッシュから返され、内容が変わると再読み込みされることを確認."""
+        definitions_path = tmp_path / "project_definitions.yaml"
+        definitions_path.write_text("projects:\n  仕事:\n    description: 業務\n", encoding="utf-8")
+
+        generator = AIFeedbackGenerator(project_definitions_path=str(definitions_path))
+        assert generator.project_definitions == {"仕事": {"description": "業務"}}
+
+        # 返り値を変更してもキャッシュには影響しない
+        generator.project_definitions["仕事"]["description"] = "変更"
+        cached = generator._load_project_definitions(str(definitions_path))
+        assert cached == {"仕事": {"description": "業務"}}
+
+        # ファイルを更新するとサイズが変わり再読み込みされる
+        definitions_path.write_text(
+            "projects:\n  趣味:\n    description: 読書と散歩\n", encoding="utf-8"
+        )
+        reloaded = generator._load_project_definitions(str(definitions_path))
+        assert reloaded == {"趣味": {"description": "読書と散歩"}}
+
+    def test_プロンプトテンプレートの波括弧と未知のプレースホルダーが保持される(self, tmp_path):
+        """既知のプレースホルダーのみ置換され、それ以外の波括弧はそのまま残ることを確認."""
+        template_path = tmp_path / "brace_template.md"
+        template_path.write_text(
+            '出力例: {"score": 1}\n{unknown_section}\n{project_data}\n', encoding="utf-8"
+        )
+
+        generator = AIFeedbackGenerator(prompt_template_path=str(template_path))
+        prompt = generator._build_prompt(
+            project_summary={"total_projects": 2},
+            mode_summary={"total_modes": 2},
+            routine_summary={"total_hours": 2.25},
+        )
+
+        assert '出力例: {"score": 1}' in prompt
+        assert "{unknown_section}" in prompt
+        assert '"total_projects": 2' in prompt
+
+    def test_ストリーミングレスポンスが結合されコールバックに渡される(self):
+        """converse_streamの各チャンクが順にコールバックへ渡され、結合結果が返ることを確認."""
+        generator = AIFeedbackGenerator()
+        generator.bedrock_client = MagicMock()
+        generator.bedrock_client.converse_stream.return_value = {
+            "stream": [
+                {"messageStart": {"role": "assistant"}},
+                {"contentBlockDelta": {"delta": {"text": "## 現状"}}},
+                {"contentBlockDelta": {"delta": {"text": "分析"}}},
+                {"messageStop": {"stopReason": "end_turn"}},
+            ]
+        }
+        received: list[str] = []
+
+        feedback = generator.generate_feedback(
+            project_summary={"total_projects": 2},
+            mode_summary={"total_modes": 2},
+            routine_summary={"total_hours": 2.25},
+            on_chunk=received.append,
+        )
+
+        assert feedback == "## 現状分析"
+        assert received == ["## 現状", "分析"]
+
+    def test_ストリーミング失敗時にフォールバックフィードバックが返る(self):
+        """Bedrock呼び出しが失敗した場合、フォールバックのフィードバックが返ることを確認."""
+        generator = AIFeedbackGenerator()
+        generator.bedrock_client = MagicMock()
+        generator.bedrock_client.converse_stream.side_effect = Exception("Throttling")
+
+        feedback = generator.generate_feedback(
+            project_summary={"total_projects": 2},
+            mode_summary={"total_modes": 2},
+            routine_summary={"total_hours": 2.25},
+        )
+
+        assert "AI分析サービスに接続できませんでした" in feedback
+
+    def test_ストリーミングが途中で失敗した場合_区切りを出力してフォールバックする(self):
+        """出力済みの部分的なテキストの後に区切りが渡され、フォールバックが返ることを確認."""
+
+        def broken_stream():
+            yield {"contentBlockDelta": {"delta": {"text": "## 現状"}}}
+            raise Exception("Connection reset")
+
+        generator = AIFeedbackGenerator()
+        generator.bedrock_client = MagicMock()
+        generator.bedrock_client.converse_stream.return_value = {"stream": broken_stream()}
+        received: list[str] = []
+
+        feedback = generator.generate_feedback(
+            project_summary={"total_projects": 2},
+            mode_summary={"total_modes": 2},
+            routine_summary={"total_hours": 2.25},
+            on_chunk=received.append,
+        )
+
+        assert "AI分析サービスに接続できませんでした" in feedback
+        assert received[0] == "## 現状"
+        assert "受信が中断されました" in received[-1]
+
+    def test_Bedrockクライアントがインスタンス間で再利用される(self):
+        """同じリージョンの場合、Bedrockクライアントが再生成されないことを確認."""
+        first = AIFeedbackGenerator()
+        second = AIFeedbackGenerator()
+
+        assert first.bedrock_client is second.bedrock_client
+
     def test_標準プロンプトテンプレートが取得できる(self):
         """標準プロンプトテンプレートが正しく取得できることを確認."""
         generator = AIFeedbackGenerator()
@@ -1,295 +1,308 @@
 """cli.pyモジュールのテスト."""
 
-from contextlib import contextmanager
+from collections.abc import Generator
+from contextlib import ExitStack
 from datetime import date, timedelta
+from operator import attrgetter
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from click.testing import CliRunner
+from playwright import sync_api
 
+from tccretro import export as export_mod
+from tccretro import login as login_mod
 from tccretro.cli import main
 
+# 収集時に一度だけ計算する前日の日付。
+# 収集後に日付をまたいでテストが実行されると、CLI側の「昨日」とずれるため
+# default_yesterday のケースは失敗する (日付またぎでの実行は想定しない)。
+_YESTERDAY = date.today() - timedelta(days=1)
 
-class TestCLI:
-    """CLIのテストスイート."""
+# CLIが遅延importする依存関係 (定義元モジュール, 属性名, モッククラス)。
+# マジックメソッドが必要なのはコンテキストマネージャとして使う sync_playwright のみ。
+_CLI_PATCH_TARGETS = (
+    (sync_api, "sync_playwright", MagicMock),
+    (login_mod, "create_login_from_env", Mock),
+    (export_mod, "TaskChuteExporter", Mock),
+)
 
-    @pytest.fixture
-    def runner(self) -> CliRunner:
-        """Click CLIRunnerを作成."""
-        return CliRunner()
-
-    @contextmanager
-    def _mock_cli_dependencies(self, runner: CliRunner | None = None):
-        """CLIの依存関係をモック化するヘルパー."""
-        # 分離されたファイルシステムを使用する場合
-        if runner:
-            with runner.isolated_filesystem():
-                # 空の.envファイルを作成
-                Path(".env").touch()
-                yield from self._do_mock_cli_dependencies()
-        else:
-            yield from self._do_mock_cli_dependencies()
-
-    def _do_mock_cli_dependencies(self):
-        """実際のモック化処理."""
-        with (
-            patch("tccretro.cli.load_dotenv"),
-            patch("tccretro.cli.sync_playwright") as mock_playwright,
-            patch("tccretro.cli.create_login_from_env") as mock_create_login,
-            patch("tccretro.cli.TaskChuteExporter") as mock_exporter_class,
-        ):
-            # Playwrightのモック
-            mock_pw = MagicMock()
-            mock_context = MagicMock()
-            mock_page = MagicMock()
-            mock_playwright.return_value.__enter__.return_value = mock_pw
-            mock_pw.chromium.launch_persistent_context.return_value = mock_context
-            mock_context.new_page.return_value = mock_page
-
-            # ログインのモック
-            mock_login = MagicMock()
-            mock_create_login.return_value = mock_login
-
-            # エクスポーターのモック
-            mock_exporter = MagicMock()
-            mock_exporter_class.return_value = mock_exporter
-
-            yield {
-                "playwright": mock_playwright,
-                "pw": mock_pw,
-                "context": mock_context,
-                "page": mock_page,
-                "login": mock_login,
-                "exporter_class": mock_exporter_class,
-                "exporter": mock_exporter,
-            }
 
-    def test_help_option(self, runner: CliRunner):
-        """--helpオプションが正しく動作することを確認."""
-        result = runner.invoke(main, ["--help"])
+@pytest.fixture(scope="class")
+def runner() -> CliRunner:
+    """Click CLIRunnerを作成 (invokeごとに入出力は分離されるためクラスで共有)."""
+    return CliRunner()
 
-        assert result.exit_code == 0
-        assert "TaskChute Cloud エクスポート自動化ツール" in result.output
-        # --login-timeoutオプションがヘルプに表示されることを確認
-        assert "--login-timeout" in result.output
 
-    def test_default_export_date_is_yesterday(self, runner: CliRunner):
-        """デフォルトのエクスポート日付が昨日であることを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
-            mocks["exporter"].export_data.return_value = "/tmp/export.csv"
-
-            result = runner.invoke(main, [])
-
-            # 昨日の日付を計算
-            yesterday = date.today() - timedelta(days=1)
-
-            # export_dataが昨日の日付で呼ばれたことを確認
-            assert result.exit_code == 0
-            mocks["exporter"].export_data.assert_called_once_with(
-                mocks["page"], start_date=yesterday, end_date=yesterday
-            )
-
-    def test_export_date_option(self, runner: CliRunner):
-        """--export-dateオプションが正しく動作することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
-            mocks["exporter"].export_data.return_value = "/tmp/export.csv"
-
-            result = runner.invoke(main, ["--export-date", "2025-01-15"])
-
-            assert result.exit_code == 0
-            # export_dataが指定日付で呼ばれたことを確認
-            mocks["exporter"].export_data.assert_called_once_with(
-                mocks["page"], start_date=date(2025, 1, 15), end_date=date(2025, 1, 15)
-            )
-
-    def test_export_date_range_options(self, runner: CliRunner):
-        """--export-start-dateと--export-end-dateオプションが正しく動作することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
-            mocks["exporter"].export_data.return_value = "/tmp/export.csv"
-
-            result = runner.invoke(
-                main, ["--export-start-date", "2025-01-01", "--export-end-date", "2025-01-31"]
-            )
-
-            assert result.exit_code == 0
-            # export_dataが指定範囲で呼ばれたことを確認
-            mocks["exporter"].export_data.assert_called_once_with(
-                mocks["page"], start_date=date(2025, 1, 1), end_date=date(2025, 1, 31)
-            )
-
-    def test_partial_date_range_error(self, runner: CliRunner):
-        """開始日または終了日のみが指定された場合、エラーを返す."""
-        with runner.isolated_filesystem():
-            # 空の.envファイルを作成
-            Path(".env").touch()
+@pytest.fixture(scope="session")
+def env_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """空の.envファイルを含む作業ディレクトリをセッションで一度だけ作成."""
+    directory = tmp_path_factory.mktemp("cli_env")
+    (directory / ".env").touch()
+    return directory
 
-            with patch("tccretro.cli.load_dotenv"):
-                result = runner.invoke(main, ["--export-start-date", "2025-01-01"])
 
-                assert result.exit_code == 1
-                assert "両方指定する必要があります" in result.output
+@pytest.fixture
+def chdir_env(env_dir: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """作業ディレクトリを.envを含むディレクトリに切り替える."""
+    monkeypatch.chdir(env_dir)
+    return env_dir
 
-    def test_login_only_option(self, runner: CliRunner):
-        """--login-onlyオプションが正しく動作することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
 
-            result = runner.invoke(main, ["--login-only"])
+@pytest.fixture(scope="class")
+def cli_mocks() -> Generator[SimpleNamespace, None, None]:
+    """CLIの依存関係をクラス単位で一度だけモック化する."""
+    with ExitStack() as stack:
+        playwright, create_login, exporter_class = (
+            stack.enter_context(patch.object(module, name, new_callable=mock_class))
+            for module, name, mock_class in _CLI_PATCH_TARGETS
+        )
 
-            assert result.exit_code == 0
-            assert "ログインテスト完了" in result.output
-            # wait_for_manual_login=Trueで呼ばれることを確認
-            mocks["login"].login.assert_called_once_with(
-                mocks["page"], wait_for_manual_login=True, manual_timeout_sec=300
-            )
-            # export_dataが呼ばれないことを確認
-            mocks["exporter"].export_data.assert_not_called()
+        yield SimpleNamespace(
+            playwright=playwright,
+            pw=Mock(),
+            context=Mock(),
+            page=Mock(),
+            create_login=create_login,
+            login=Mock(),
+            exporter_class=exporter_class,
+            exporter=Mock(),
+        )
 
-    def test_login_only_with_timeout_option(self, runner: CliRunner):
-        """--login-only --login-timeoutオプションが正しく動作することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
 
-            result = runner.invoke(main, ["--login-only", "--login-timeout", "600"])
+@pytest.fixture
+def mocks(cli_mocks: SimpleNamespace, chdir_env: Path) -> SimpleNamespace:
+    """テストごとにモックの状態をリセットし、.envを含むディレクトリで返す."""
+    for mock in vars(cli_mocks).values():
+        mock.reset_mock(return_value=True, side_effect=True)
 
-            assert result.exit_code == 0
-            # manual_timeout_sec=600で呼ばれることを確認
-            mocks["login"].login.assert_called_once_with(
-                mocks["page"], wait_for_manual_login=True, manual_timeout_sec=600
-            )
+    # Playwrightのモック
+    cli_mocks.playwright.return_value.__enter__.return_value = cli_mocks.pw
+    cli_mocks.pw.chromium.launch_persistent_context.return_value = cli_mocks.context
+    cli_mocks.context.new_page.return_value = cli_mocks.page
 
-    def test_login_only_headless_warning(self, runner: CliRunner):
-        """--login-onlyをheadlessモードで実行した場合、警告が表示されることを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = False
+    # ログインのモック
+    cli_mocks.create_login.return_value = cli_mocks.login
 
-            result = runner.invoke(main, ["--login-only"])
+    # エクスポーターのモック
+    cli_mocks.exporter_class.plan_export.return_value = [(date.today(), date.today())]
+    cli_mocks.exporter_class.return_value = cli_mocks.exporter
 
-            assert result.exit_code == 1
-            assert "警告" in result.output or "[警告]" in result.output
-            assert "headless" in result.output.lower() or "headless" in result.output
-            assert "--debug" in result.output
+    return cli_mocks
 
-    def test_login_only_with_debug_no_warning(self, runner: CliRunner):
-        """--login-only --debugの場合、警告が表示されないことを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
 
-            result = runner.invoke(main, ["--login-only", "--debug"])
+class TestCLI:
+    """CLIのテストスイート."""
 
-            assert result.exit_code == 0
-            # 警告メッセージが含まれないことを確認
-            assert "警告" not in result.output and "[警告]" not in result.output
+    def test_help_option(self, runner: CliRunner):
+        """--helpオプションが正しく動作することを確認."""
+        result = runner.invoke(main, ["--help"])
 
-    def test_login_only_failure_exits_with_code_1(self, runner: CliRunner):
-        """--login-onlyでログイン失敗時、終了コード1で終了することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = False
+        assert result.exit_code == 0
+        assert "TaskChute Cloud エクスポート自動化ツール" in result.output
+        # --login-timeoutオプションがヘルプに表示されることを確認
+        assert "--login-timeout" in result.output
 
-            result = runner.invoke(main, ["--login-only"])
+    @pytest.mark.parametrize(
+        ("argv", "start", "end"),
+        [
+            pytest.param([], _YESTERDAY, _YESTERDAY, id="default_yesterday"),
+            pytest.param(
+                ["--export-date", "2025-01-15"],
+                date(2025, 1, 15),
+                date(2025, 1, 15),
+                id="export_date",
+            ),
+            pytest.param(
+                ["--export-start-date", "2025-01-01", "--export-end-date", "2025-01-31"],
+                date(2025, 1, 1),
+                date(2025, 1, 31),
+                id="export_date_range",
+            ),
+        ],
+    )
+    def test_export_date_options(
+        self, runner: CliRunner, mocks: SimpleNamespace, argv: list[str], start: date, end: date
+    ):
+        """日付オプションに応じた期間でexport_dataが呼ばれることを確認."""
+        mocks.login.login.return_value = True
+        mocks.exporter.export_data.return_value = "/tmp/export.csv"
+
+        result = runner.invoke(main, argv)
 
-            assert result.exit_code == 1
-            assert "ログインが検出されませんでした" in result.output
+        assert result.exit_code == 0
+        mocks.exporter.export_data.assert_called_once_with(
+            mocks.page, start_date=start, end_date=end
+        )
 
-    def test_login_only_and_export_only_conflict(self, runner: CliRunner):
+    def test_partial_date_range_error(self, runner: CliRunner, chdir_env: Path):
+        """開始日または終了日のみが指定された場合、エラーを返す."""
+        result = runner.invoke(main, ["--export-start-date", "2025-01-01"])
+
+        assert result.exit_code == 1
+        assert "両方指定する必要があります" in result.output
+
+    @pytest.mark.parametrize(
+        ("argv", "login_ret", "exit_code", "expected", "unexpected"),
+        [
+            pytest.param(["--login-only"], True, 0, ["ログインテスト完了"], [], id="login_only"),
+            pytest.param(
+                ["--login-only", "--login-timeout", "600"],
+                True,
+                0,
+                ["ログインテスト完了"],
+                [],
+                id="login_only_with_timeout",
+            ),
+            pytest.param(
+                ["--login-only"],
+                False,
+                1,
+                ["[警告]", "headless", "--debug"],
+                [],
+                id="login_only_headless_warning",
+            ),
+            pytest.param(
+                ["--login-only", "--debug"], True, 0, [], ["警告"], id="login_only_debug_no_warning"
+            ),
+            pytest.param(
+                ["--login-only"],
+                False,
+                1,
+                ["ログインが検出されませんでした"],
+                [],
+                id="login_only_failure",
+            ),
+            pytest.param([], False, 1, ["ログイン失敗"], [], id="login_failure"),
+        ],
+    )
+    def test_login_outcomes(
+        self,
+        runner: CliRunner,
+        mocks: SimpleNamespace,
+        argv: list[str],
+        login_ret: bool,
+        exit_code: int,
+        expected: list[str],
+        unexpected: list[str],
+    ):
+        """ログイン結果とオプションに応じた終了コードと出力を確認."""
+        mocks.login.login.return_value = login_ret
+
+        result = runner.invoke(main, argv)
+
+        assert result.exit_code == exit_code
+        for needle in expected:
+            assert needle in result.output
+        for needle in unexpected:
+            assert needle not in result.output
+
+    @pytest.mark.parametrize(
+        ("argv", "timeout"),
+        [
+            pytest.param(["--login-only"], 300, id="default"),
+            pytest.param(["--login-only", "--login-timeout", "600"], 600, id="custom"),
+        ],
+    )
+    def test_login_only_waits_for_manual_login(
+        self, runner: CliRunner, mocks: SimpleNamespace, argv: list[str], timeout: int
+    ):
+        """--login-onlyでは手動ログインを待機し、エクスポートしないことを確認."""
+        mocks.login.login.return_value = True
+
+        runner.invoke(main, argv)
+
+        mocks.login.login.assert_called_once_with(
+            mocks.page, wait_for_manual_login=True, manual_timeout_sec=timeout
+        )
+        mocks.exporter.export_data.assert_not_called()
+
+    def test_login_only_and_export_only_conflict(self, runner: CliRunner, chdir_env: Path):
         """--login-onlyと--export-onlyが同時に指定された場合、エラーを返す."""
-        with runner.isolated_filesystem():
-            Path(".env").touch()
-            with patch("tccretro.cli.load_dotenv"):
-                result = runner.invoke(main, ["--login-only", "--export-only"])
-
-                assert result.exit_code == 1
-                assert "同時に指定できません" in result.output
+        result = runner.invoke(main, ["--login-only", "--export-only"])
 
-    def test_login_failure_exits(self, runner: CliRunner):
-        """ログイン失敗時にプログラムが終了することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = False
+        assert result.exit_code == 1
+        assert "同時に指定できません" in result.output
 
-            result = runner.invoke(main, [])
-
-            assert result.exit_code == 1
-            assert "ログイン失敗" in result.output
-
-    def test_export_failure_exits(self, runner: CliRunner):
+    def test_export_failure_exits(self, runner: CliRunner, mocks: SimpleNamespace):
         """エクスポート失敗時にプログラムが終了することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
-            mocks["exporter"].export_data.return_value = None
+        mocks.login.login.return_value = True
+        mocks.exporter.export_data.return_value = None
 
-            result = runner.invoke(main, [])
+        result = runner.invoke(main, [])
 
-            assert result.exit_code == 1
-            assert "エクスポート失敗" in result.output
+        assert result.exit_code == 1
+        assert "エクスポート失敗" in result.output
+        mocks.login.invalidate_login_cache.assert_called_once()
 
-    def test_debug_mode_option(self, runner: CliRunner):
+    def test_debug_mode_option(self, runner: CliRunner, mocks: SimpleNamespace):
         """--debugオプションがheadlessモードを無効化することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
-            mocks["exporter"].export_data.return_value = "/tmp/export.csv"
+        mocks.login.login.return_value = True
+        mocks.exporter.export_data.return_value = "/tmp/export.csv"
 
-            result = runner.invoke(main, ["--debug"])
+        result = runner.invoke(main, ["--debug"])
 
-            # headless=Falseで呼ばれることを確認
-            assert result.exit_code == 0
-            call_kwargs = mocks["pw"].chromium.launch_persistent_context.call_args.kwargs
-            assert call_kwargs["headless"] is False
+        # headless=Falseで呼ばれることを確認
+        assert result.exit_code == 0
+        call_kwargs = mocks.pw.chromium.launch_persistent_context.call_args.kwargs
+        assert call_kwargs["headless"] is False
 
-    def test_output_dir_option(self, runner: CliRunner, tmp_path: Path):
+    def test_output_dir_option(self, runner: CliRunner, tmp_path: Path, mocks: SimpleNamespace):
         """--output-dirオプションが正しく動作することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
-            mocks["exporter"].export_data.return_value = "/tmp/export.csv"
-
-            output_dir = tmp_path / "custom_output"
-            result = runner.invoke(main, ["--output-dir", str(output_dir)])
-
-            assert result.exit_code == 0
-            # TaskChuteExporterが指定ディレクトリで初期化されることを確認
-            mocks["exporter_class"].assert_called_once()
-            call_kwargs = mocks["exporter_class"].call_args.kwargs
-            assert call_kwargs["download_dir"] == str(output_dir)
-
-    def test_keyboard_interrupt_handling(self, runner: CliRunner):
-        """KeyboardInterruptが正しく処理されることを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            # ログインでKeyboardInterruptを発生させる
-            mocks["login"].login.side_effect = KeyboardInterrupt()
-
-            result = runner.invoke(main, [])
-
-            assert result.exit_code == 130
-            assert "中断されました" in result.output
-
-    def test_exception_handling(self, runner: CliRunner):
-        """一般的な例外が正しく処理されることを確認."""
-        with runner.isolated_filesystem():
-            Path(".env").touch()
-            with (
-                patch("tccretro.cli.load_dotenv"),
-                patch("tccretro.cli.sync_playwright") as mock_playwright,
-            ):
-                # Playwrightで例外を発生させる
-                mock_playwright.side_effect = Exception("Unexpected error")
-
-                result = runner.invoke(main, [])
-
-                assert result.exit_code == 1
-                assert "エラー: Unexpected error" in result.output
-
-    def test_slow_mo_option(self, runner: CliRunner):
+        mocks.login.login.return_value = True
+        mocks.exporter.export_data.return_value = "/tmp/export.csv"
+
+        output_dir = tmp_path / "custom_output"
+        result = runner.invoke(main, ["--output-dir", str(output_dir)])
+
+        assert result.exit_code == 0
+        # TaskChuteExporterが指定ディレクトリで初期化されることを確認
+        mocks.exporter_class.assert_called_once()
+        call_kwargs = mocks.exporter_class.call_args.kwargs
+        assert call_kwargs["download_dir"] == str(output_dir)
+
+    @pytest.mark.parametrize(
+        ("target", "exc", "exit_code", "needle"),
+        [
+            pytest.param(
+                "login.login", KeyboardInterrupt(), 130, "中断されました", id="keyboard_interrupt"
+            ),
+            pytest.param(
+                "playwright",
+                Exception("Unexpected error"),
+                1,
+                "エラー: Unexpected error",
+                id="unexpected_error",
+            ),
+        ],
+    )
+    def test_exception_handling(
+        self,
+        runner: CliRunner,
+        mocks: SimpleNamespace,
+        target: str,
+        exc: BaseException,
+        exit_code: int,
+        needle: str,
+    ):
+        """例外発生時の終了コードとメッセージを確認."""
+        attrgetter(target)(mocks).side_effect = exc
+
+        result = runner.invoke(main, [])
+
+        assert result.exit_code == exit_code
+        assert needle in result.output
+
+    def test_slow_mo_option(self, runner: CliRunner, mocks: SimpleNamespace):
         """--slow-moオプションが正しく動作することを確認."""
-        with self._mock_cli_dependencies(runner) as mocks:
-            mocks["login"].login.return_value = True
-            mocks["exporter"].export_data.return_value = "/tmp/export.csv"
+        mocks.login.login.return_value = True
+        mocks.exporter.export_data.return_value = "/tmp/export.csv"
 
-            result = runner.invoke(main, ["--slow-mo", "1000"])
+        result = runner.invoke(main, ["--slow-mo", "1000"])
 
-            # slow_mo=1000で呼ばれることを確認
-            assert result.exit_code == 0
-            call_kwargs = mocks["pw"].chromium.launch_persistent_context.call_args.kwargs
-            assert call_kwargs["slow_mo"] == 1000
+        # slow_mo=1000で呼ばれることを確認
+        assert result.exit_code == 0
+        call_kwargs = mocks.pw.chromium.launch_persistent_context.call_args.kwargs
+        assert call_kwargs["slow_mo"] == 1000
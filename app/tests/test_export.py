@@ -1,12 +1,89 @@
 """export.pyモジュールのテスト."""
 
-from contextlib import contextmanager
+import copy
+import errno
+import logging
+import os
 from datetime import date
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import Mock, patch
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from tccretro.export import TaskChuteExporter
 
+# テストで繰り返し使う日付 (dateはイミュータブルなため共有して問題ない)
+_JAN_01 = date(2025, 1, 1)
+_JAN_31 = date(2025, 1, 31)
+_NOV_10 = date(2025, 11, 10)
+_NOV_11 = date(2025, 11, 11)
+_NOV_12 = date(2025, 11, 12)
+_NOV_13 = date(2025, 11, 13)
+_NOV_14 = date(2025, 11, 14)
+
+_SINGLE_INPUT_SELECTOR = 'input[placeholder*="YYYY"]'
+_ENABLED_DOWNLOAD_BUTTON_SELECTOR = 'button:has-text("ダウンロード"):enabled'
+# 個別入力方式の日付フィールド (開始の年月日、終了の年月日の順)
+_DATE_FIELD_SELECTORS = tuple(
+    f'[aria-label="{label}"][data-range-position="{position}"]'
+    for position in ("start", "end")
+    for label in ("年", "月", "日")
+)
+
+
+def _touch_many(directory: Path, names: list[str]) -> None:
+    """空ファイルをまとめて作成する (pathlibを経由せず os.open/os.close のみ)."""
+    flags = os.O_CREAT | os.O_WRONLY | os.O_CLOEXEC
+    for name in names:
+        os.close(os.open(os.path.join(directory, name), flags, 0o644))
+
+
+class _DownloadInfo:
+    """page.expect_download() が返すコンテキストマネージャの代替."""
+
+    def __init__(self, download: Mock):
+        self.value = download
+
+    def __enter__(self) -> "_DownloadInfo":
+        return self
+
+    def __exit__(self, *exc_info: object) -> bool:
+        return False
+
+
+@pytest.fixture(scope="session")
+def exporter_proto(tmp_path_factory: pytest.TempPathFactory) -> TaskChuteExporter:
+    """テスト全体で一度だけ初期化するエクスポーターのプロトタイプ."""
+    return TaskChuteExporter(download_dir=str(tmp_path_factory.mktemp("exporter_proto")))
+
+
+@pytest.fixture
+def exporter(exporter_proto: TaskChuteExporter, temp_download_dir: Path) -> TaskChuteExporter:
+    """プロトタイプを複製し、テストごとのダウンロードディレクトリを割り当てる.
+
+    Locatorキャッシュはテスト間で共有しないよう新しく作り直す。
+    """
+    exporter = copy.copy(exporter_proto)
+    exporter.download_dir = temp_download_dir
+    exporter._locator_page = None
+    exporter._locators = {}
+    return exporter
+
+
+@pytest.fixture
+def date_field_locators() -> dict[str, Mock]:
+    """日付入力フィールドのセレクタごとのLocatorモックを作成する.
+
+    マジックメソッドは不要なため軽量な Mock を使い、.first は自身を返す。
+    """
+    locators = {}
+    for selector in (_SINGLE_INPUT_SELECTOR, *_DATE_FIELD_SELECTORS):
+        locator = Mock()
+        locator.first = locator
+        locators[selector] = locator
+    return locators
+
 
 class TestTaskChuteExporter:
     """TaskChuteExporterクラスのテストスイート."""
@@ -20,6 +97,8 @@ class TestTaskChuteExporter:
         assert exporter.download_dir == download_dir
         assert download_dir.exists()
         assert exporter.debug is False
+        # スクリーンショット用のスレッドプールはデバッグモードで撮影するまで作成しない
+        assert exporter._screenshot_pool is None
 
     def test_init_with_debug_mode(self, tmp_path: Path):
         """__init__: デバッグモードが正しく設定されることを確認."""
@@ -27,11 +106,12 @@ class TestTaskChuteExporter:
 
         assert exporter.debug is True
 
-    def test_fill_date_range_single_input_success(self, mock_page: Mock, mock_locator: Mock):
+    def test_fill_date_range_single_input_success(
+        self, exporter: TaskChuteExporter, mock_page: Mock, mock_locator: Mock
+    ):
         """fill_date_range: 単一入力方式で日付範囲を正常に入力."""
-        exporter = TaskChuteExporter()
-        start_date = date(2025, 1, 1)
-        end_date = date(2025, 1, 31)
+        start_date = _JAN_01
+        end_date = _JAN_31
 
         # 単一入力フィールドが見つかる場合
         mock_locator.count.return_value = 1
@@ -44,63 +124,98 @@ class TestTaskChuteExporter:
         mock_locator.click.assert_called_once()
         mock_locator.fill.assert_called_once_with("2025/01/01 - 2025/01/31")
         mock_locator.press.assert_called_once_with("Enter")
+        # 固定時間の待機も、マスク付きの値との一致待ちも行わない
+        mock_page.wait_for_timeout.assert_not_called()
+        mock_locator.page.wait_for_function.assert_not_called()
+        # 日付範囲の確定はダウンロードボタンの有効化で確認する
+        mock_page.wait_for_selector.assert_called_once_with(
+            _ENABLED_DOWNLOAD_BUTTON_SELECTOR, timeout=10000
+        )
 
-    def test_fill_date_range_individual_fields_success(self, mock_page: Mock):
+    def test_fill_date_range_single_input_not_committed(
+        self, exporter: TaskChuteExporter, mock_page: Mock, mock_locator: Mock, caplog
+    ):
+        """fill_date_range: ダウンロードボタンが有効にならない場合、Falseを返す."""
+        mock_locator.count.return_value = 1
+        mock_page.locator.return_value = mock_locator
+        mock_page.wait_for_selector.side_effect = PlaywrightTimeoutError("Timeout")
+
+        result = exporter.fill_date_range(mock_page, _JAN_01, _JAN_31)
+
+        assert result is False
+        assert "日付範囲の確定" in caplog.text
+
+    def test_fill_date_range_individual_fields_success(
+        self, exporter: TaskChuteExporter, mock_page: Mock, date_field_locators: dict[str, Mock]
+    ):
         """fill_date_range: 個別フィールド方式で日付範囲を正常に入力."""
-        exporter = TaskChuteExporter()
         start_date = date(2025, 1, 15)
         end_date = date(2025, 1, 20)
 
-        # 単一入力フィールドが見つからない場合
-        mock_single_input = MagicMock()
-        mock_single_input.count.return_value = 0
-
-        # 個別フィールドのモック
-        mock_year_start = MagicMock()
-        mock_year_start.count.return_value = 1
-        mock_month_start = MagicMock()
-        mock_day_start = MagicMock()
-        mock_year_end = MagicMock()
-        mock_month_end = MagicMock()
-        mock_day_end = MagicMock()
-
-        # locatorの呼び出しごとに異なるモックを返す
-        locator_map = {
-            'input[placeholder*="YYYY"]': mock_single_input,
-            '[aria-label="年"][data-range-position="start"]': mock_year_start,
-            '[aria-label="月"][data-range-position="start"]': mock_month_start,
-            '[aria-label="日"][data-range-position="start"]': mock_day_start,
-            '[aria-label="年"][data-range-position="end"]': mock_year_end,
-            '[aria-label="月"][data-range-position="end"]': mock_month_end,
-            '[aria-label="日"][data-range-position="end"]': mock_day_end,
-        }
-
-        def locator_side_effect(selector: str):
-            mock = locator_map.get(selector, MagicMock())
-            mock.first = mock
-            return mock
-
-        mock_page.locator.side_effect = locator_side_effect
+        # 単一入力フィールドは見つからず、個別フィールドが見つかる場合
+        date_field_locators[_SINGLE_INPUT_SELECTOR].count.return_value = 0
+        date_field_locators[_DATE_FIELD_SELECTORS[0]].count.return_value = 1
+        # .first の配線はフィクスチャで済んでいるため、辞書の参照だけで返す
+        mock_page.locator.side_effect = date_field_locators.__getitem__
 
         result = exporter.fill_date_range(mock_page, start_date, end_date)
 
         assert result is True
         # 各フィールドに正しい値が入力されたことを確認
-        mock_year_start.fill.assert_called_once_with("2025")
-        mock_month_start.fill.assert_called_once_with("1")
-        mock_day_start.fill.assert_called_once_with("15")
-        mock_year_end.fill.assert_called_once_with("2025")
-        mock_month_end.fill.assert_called_once_with("1")
-        mock_day_end.fill.assert_called_once_with("20")
-
-    def test_fill_date_range_failure_no_fields(self, mock_page: Mock):
+        for selector, value in zip(
+            _DATE_FIELD_SELECTORS, ("2025", "1", "15", "2025", "1", "20"), strict=True
+        ):
+            date_field_locators[selector].fill.assert_called_once_with(value)
+        mock_page.wait_for_selector.assert_called_once_with(
+            _ENABLED_DOWNLOAD_BUTTON_SELECTOR, timeout=10000
+        )
+        mock_page.wait_for_load_state.assert_not_called()
+
+    def test_fill_date_range_individual_fields_settle_timeout(
+        self,
+        exporter: TaskChuteExporter,
+        mock_page: Mock,
+        date_field_locators: dict[str, Mock],
+        caplog,
+    ):
+        """fill_date_range: 入力値の反映待ちがタイムアウトしても、警告を出して入力を続行する."""
+        date_field_locators[_SINGLE_INPUT_SELECTOR].count.return_value = 0
+        date_field_locators[_DATE_FIELD_SELECTORS[0]].count.return_value = 1
+        mock_page.locator.side_effect = date_field_locators.__getitem__
+        for selector in _DATE_FIELD_SELECTORS:
+            field_page = date_field_locators[selector].page
+            field_page.wait_for_function.side_effect = PlaywrightTimeoutError("Timeout")
+
+        with caplog.at_level(logging.WARNING, logger="tccretro.export"):
+            result = exporter.fill_date_range(mock_page, _JAN_01, _JAN_31)
+
+        assert result is True
+        assert caplog.text.count("入力値の反映を確認できませんでした") == len(_DATE_FIELD_SELECTORS)
+
+    def test_fill_date_range_reuses_cached_locator(
+        self, exporter: TaskChuteExporter, mock_page: Mock, mock_locator: Mock
+    ):
+        """fill_date_range: 同じページではLocatorを再利用し、ページ遷移時に破棄する."""
+        mock_page.locator.return_value = mock_locator
+
+        exporter.fill_date_range(mock_page, _JAN_01, _JAN_31)
+        exporter.fill_date_range(mock_page, date(2025, 2, 1), date(2025, 2, 28))
+
+        assert mock_page.locator.call_count == 1
+
+        exporter._prepare_export_page(mock_page)
+        exporter.fill_date_range(mock_page, date(2025, 3, 1), date(2025, 3, 31))
+
+        assert mock_page.locator.call_count == 2
+
+    def test_fill_date_range_failure_no_fields(self, exporter: TaskChuteExporter, mock_page: Mock):
         """fill_date_range: 日付フィールドが見つからない場合、Falseを返す."""
-        exporter = TaskChuteExporter()
-        start_date = date(2025, 1, 1)
-        end_date = date(2025, 1, 31)
+        start_date = _JAN_01
+        end_date = _JAN_31
 
         # すべてのフィールドが見つからない
-        mock_locator = MagicMock()
+        mock_locator = Mock()
+        mock_locator.first = mock_locator
         mock_locator.count.return_value = 0
         mock_page.locator.return_value = mock_locator
 
@@ -108,11 +223,12 @@ class TestTaskChuteExporter:
 
         assert result is False
 
-    def test_fill_date_range_exception_handling(self, mock_page: Mock, capsys):
+    def test_fill_date_range_exception_handling(
+        self, exporter: TaskChuteExporter, mock_page: Mock, caplog
+    ):
         """fill_date_range: 例外が発生した場合、Falseを返す."""
-        exporter = TaskChuteExporter()
-        start_date = date(2025, 1, 1)
-        end_date = date(2025, 1, 31)
+        start_date = _JAN_01
+        end_date = _JAN_31
 
         # locatorで例外を発生させる
         mock_page.locator.side_effect = Exception("Element not found")
@@ -120,122 +236,116 @@ class TestTaskChuteExporter:
         result = exporter.fill_date_range(mock_page, start_date, end_date)
 
         assert result is False
-        captured = capsys.readouterr()
-        assert "日付範囲の入力に失敗しました" in captured.out
-
+        assert "日付範囲の入力に失敗しました" in caplog.text
+
+    @pytest.mark.parametrize(
+        ("debug", "dates"),
+        [
+            pytest.param(False, (_JAN_01, _JAN_31), id="success"),
+            # 日付が指定されていない場合、デフォルト (昨日) を使用
+            pytest.param(False, (), id="default_dates"),
+            # デバッグモード時にスクリーンショットが保存される
+            pytest.param(True, (_JAN_01, _JAN_31), id="debug_screenshots"),
+        ],
+    )
     def test_export_data_success(
-        self, mock_page: Mock, mock_locator: Mock, mock_download: Mock, temp_download_dir: Path
+        self,
+        mock_page: Mock,
+        mock_locator: Mock,
+        mock_download: Mock,
+        temp_download_dir: Path,
+        debug: bool,
+        dates: tuple[date, ...],
     ):
         """export_data: データエクスポートが正常に成功."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir), debug=False)
-        start_date = date(2025, 1, 1)
-        end_date = date(2025, 1, 31)
-
-        # fill_date_rangeをモック化
-        with patch.object(exporter, "fill_date_range", return_value=True):
-            # ダウンロードボタンのモック
-            mock_locator.count.return_value = 1
-            mock_page.locator.return_value = mock_locator
-
-            # ダウンロードのモック
-            @contextmanager
-            def mock_expect_download(timeout):
-                yield type("obj", (object,), {"value": mock_download})
-
-            mock_page.expect_download = mock_expect_download
-
-            result = exporter.export_data(mock_page, start_date, end_date)
-
-            assert result is not None
-            assert "test_export.csv" in result
-            mock_page.goto.assert_called_once_with(
-                "https://taskchute.cloud/export/csv-export", timeout=30000
-            )
-            mock_locator.click.assert_called_once()
-            mock_download.save_as.assert_called_once()
-
-    def test_export_data_default_dates(
-        self, mock_page: Mock, mock_locator: Mock, mock_download: Mock, temp_download_dir: Path
+        exporter = TaskChuteExporter(download_dir=str(temp_download_dir), debug=debug)
+        exporter.fill_date_range = Mock(return_value=True)
+        # ダウンロードボタンのモック
+        mock_locator.count.return_value = 1
+        mock_page.locator.return_value = mock_locator
+        # ダウンロードのモック
+        mock_page.expect_download = lambda timeout: _DownloadInfo(mock_download)
+
+        result = exporter.export_data(mock_page, *dates)
+
+        assert result is not None
+        # 終了時に書き込み待ちのスクリーンショットを保存し、スレッドプールを破棄する
+        assert exporter._screenshot_pool is None
+        assert "test_export.csv" in result
+        exporter.fill_date_range.assert_called_once()
+        if dates:
+            assert exporter.fill_date_range.call_args.args == (mock_page, *dates)
+        mock_page.goto.assert_called_once_with(
+            "https://taskchute.cloud/export/csv-export", wait_until="commit", timeout=30000
+        )
+        # load イベントは待たず、日付入力フォームの表示のみを待機する
+        mock_page.wait_for_load_state.assert_not_called()
+        # ボタンの検索とクリックは1回のevaluateで行われる
+        mock_page.evaluate.assert_called_once()
+        # ダウンロード済みファイルはコピーせずリネームで移動される
+        assert (temp_download_dir / "test_export.csv").exists()
+        mock_download.save_as.assert_not_called()
+        if debug:
+            assert mock_page.screenshot.call_count >= 2
+            mock_page.screenshot.assert_called_with(type="jpeg", quality=60)
+            assert (temp_download_dir / "debug_dates_filled.jpg").exists()
+        else:
+            mock_page.screenshot.assert_not_called()
+
+    def test_export_data_cross_device_falls_back_to_save_as(
+        self,
+        exporter: TaskChuteExporter,
+        mock_page: Mock,
+        mock_locator: Mock,
+        mock_download: Mock,
+        temp_download_dir: Path,
     ):
-        """export_data: 日付が指定されていない場合、デフォルト（昨日）を使用."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-
-        with patch.object(exporter, "fill_date_range", return_value=True) as mock_fill:
-            mock_locator.count.return_value = 1
+        """export_data: 別ファイルシステムでリネームできない場合、save_asで保存する."""
+        exporter.fill_date_range = Mock(return_value=True)
+        with patch("tccretro.export.os.replace", side_effect=OSError(errno.EXDEV, "cross-device")):
             mock_page.locator.return_value = mock_locator
 
-            @contextmanager
-            def mock_expect_download(timeout):
-                yield type("obj", (object,), {"value": mock_download})
-
-            mock_page.expect_download = mock_expect_download
+            mock_page.expect_download = lambda timeout: _DownloadInfo(mock_download)
 
-            exporter.export_data(mock_page)
+            result = exporter.export_data(mock_page, _JAN_01, _JAN_31)
 
-            # fill_date_rangeが呼ばれたことを確認（具体的な日付の検証は省略）
-            assert mock_fill.called
+            assert result is not None
+            mock_download.save_as.assert_called_once_with(temp_download_dir / "test_export.csv")
 
-    def test_export_data_fill_date_failure(self, mock_page: Mock, temp_download_dir: Path):
+    def test_export_data_fill_date_failure(self, exporter: TaskChuteExporter, mock_page: Mock):
         """export_data: 日付入力に失敗した場合、Noneを返す."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
+        exporter.fill_date_range = Mock(return_value=False)
 
-        with patch.object(exporter, "fill_date_range", return_value=False):
-            result = exporter.export_data(mock_page, date(2025, 1, 1), date(2025, 1, 31))
+        result = exporter.export_data(mock_page, _JAN_01, _JAN_31)
 
-            assert result is None
+        assert result is None
 
-    def test_export_data_no_download_button(self, mock_page: Mock, temp_download_dir: Path):
+    def test_export_data_no_download_button(self, exporter: TaskChuteExporter, mock_page: Mock):
         """export_data: ダウンロードボタンが見つからない場合、Noneを返す."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
+        exporter.fill_date_range = Mock(return_value=True)
+        # 有効なダウンロードボタンが見つからない (無効なボタンはクリック対象外)
+        mock_page.evaluate.return_value = False
 
-        with patch.object(exporter, "fill_date_range", return_value=True):
-            # ダウンロードボタンが見つからない
-            mock_locator = MagicMock()
-            mock_locator.count.return_value = 0
-            mock_page.locator.return_value = mock_locator
+        mock_page.expect_download = lambda timeout: _DownloadInfo(Mock())
 
-            result = exporter.export_data(mock_page, date(2025, 1, 1), date(2025, 1, 31))
+        result = exporter.export_data(mock_page, _JAN_01, _JAN_31)
 
-            assert result is None
+        assert result is None
 
-    def test_export_data_with_debug_screenshots(
-        self, mock_page: Mock, mock_locator: Mock, mock_download: Mock, temp_download_dir: Path
+    def test_export_data_exception_handling(
+        self, exporter: TaskChuteExporter, mock_page: Mock, caplog
     ):
-        """export_data: デバッグモード時にスクリーンショットが保存される."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir), debug=True)
-
-        with patch.object(exporter, "fill_date_range", return_value=True):
-            mock_locator.count.return_value = 1
-            mock_page.locator.return_value = mock_locator
-
-            @contextmanager
-            def mock_expect_download(timeout):
-                yield type("obj", (object,), {"value": mock_download})
-
-            mock_page.expect_download = mock_expect_download
-
-            exporter.export_data(mock_page, date(2025, 1, 1), date(2025, 1, 31))
-
-            # スクリーンショットが複数回呼ばれることを確認
-            assert mock_page.screenshot.call_count >= 2
-
-    def test_export_data_exception_handling(self, mock_page: Mock, temp_download_dir: Path, capsys):
         """export_data: 例外が発生した場合、Noneを返す."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-
         # gotoで例外を発生させる
         mock_page.goto.side_effect = Exception("Network error")
 
-        result = exporter.export_data(mock_page, date(2025, 1, 1), date(2025, 1, 31))
+        result = exporter.export_data(mock_page, _JAN_01, _JAN_31)
 
         assert result is None
-        captured = capsys.readouterr()
-        assert "エクスポートがエラーで失敗しました" in captured.out
+        assert "エクスポートがエラーで失敗しました" in caplog.text
 
-    def test_wait_for_export_button_success(self, mock_page: Mock):
+    def test_wait_for_export_button_success(self, exporter: TaskChuteExporter, mock_page: Mock):
         """wait_for_export_button: エクスポートボタンが見つかった場合、Trueを返す."""
-        exporter = TaskChuteExporter()
-
         # 最初のセレクタで見つかる
         mock_page.wait_for_selector.return_value = True
 
@@ -243,196 +353,204 @@ class TestTaskChuteExporter:
 
         assert result is True
         mock_page.wait_for_selector.assert_called_once_with(
-            'button:has-text("エクスポート")', timeout=5000
+            'button:has-text("エクスポート"), button:has-text("Export"), '
+            'a:has-text("エクスポート"), a:has-text("Export")',
+            timeout=5000,
         )
 
-    def test_wait_for_export_button_fallback_selector(self, mock_page: Mock):
-        """wait_for_export_button: 複数のセレクタを試行し、見つかった場合Trueを返す."""
-        exporter = TaskChuteExporter()
-
-        # 最初のセレクタでは見つからず、2番目で見つかる
-        call_count = 0
-
-        def wait_side_effect(selector, timeout):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                raise Exception("Not found")
-            return True
-
-        mock_page.wait_for_selector.side_effect = wait_side_effect
-
-        result = exporter.wait_for_export_button(mock_page)
-
-        assert result is True
-        assert mock_page.wait_for_selector.call_count == 2
-
-    def test_wait_for_export_button_not_found(self, mock_page: Mock):
+    def test_wait_for_export_button_not_found(self, exporter: TaskChuteExporter, mock_page: Mock):
         """wait_for_export_button: すべてのセレクタで見つからない場合、Falseを返す."""
-        exporter = TaskChuteExporter()
-
         # すべてのセレクタで見つからない
         mock_page.wait_for_selector.side_effect = Exception("Not found")
 
         result = exporter.wait_for_export_button(mock_page)
 
         assert result is False
-        # 4つのセレクタすべてが試行される
-        assert mock_page.wait_for_selector.call_count == 4
+        # 複合セレクタで一度だけ待機する
+        assert mock_page.wait_for_selector.call_count == 1
 
-    def test_get_expected_filename(self, temp_download_dir: Path):
+    def test_get_expected_filename(self, exporter: TaskChuteExporter, temp_download_dir: Path):
         """get_expected_filename: 期待されるファイル名が正しく生成される."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
         target_date = date(2025, 11, 15)
 
         result = exporter.get_expected_filename(target_date)
 
         assert result == temp_download_dir / "tasks_20251115-20251115.csv"
 
-    def test_check_existing_files_all_exist(self, temp_download_dir: Path):
-        """_check_existing_files: 全てのファイルが存在する場合."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        start_date = date(2025, 11, 10)
-        end_date = date(2025, 11, 12)
-
-        # ファイルを作成
-        (temp_download_dir / "tasks_20251110-20251110.csv").touch()
-        (temp_download_dir / "tasks_20251111-20251111.csv").touch()
-        (temp_download_dir / "tasks_20251112-20251112.csv").touch()
-
-        existing_dates, missing_dates = exporter.check_existing_files(start_date, end_date)
-
-        assert len(existing_dates) == 3
-        assert len(missing_dates) == 0
-        assert existing_dates == [date(2025, 11, 10), date(2025, 11, 11), date(2025, 11, 12)]
-
-    def test_check_existing_files_some_missing(self, temp_download_dir: Path):
-        """_check_existing_files: 一部のファイルが欠けている場合."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        start_date = date(2025, 11, 10)
-        end_date = date(2025, 11, 12)
-
-        # 一部のファイルのみ作成
-        (temp_download_dir / "tasks_20251110-20251110.csv").touch()
-        # 2025-11-11は欠けている
-        (temp_download_dir / "tasks_20251112-20251112.csv").touch()
+    @pytest.mark.parametrize(
+        ("filenames", "start_date", "end_date", "expected_existing", "expected_missing"),
+        [
+            pytest.param(
+                [
+                    "tasks_20251110-20251110.csv",
+                    "tasks_20251111-20251111.csv",
+                    "tasks_20251112-20251112.csv",
+                ],
+                _NOV_10,
+                _NOV_12,
+                [_NOV_10, _NOV_11, _NOV_12],
+                [],
+                id="all_exist",
+            ),
+            pytest.param(
+                # 2025-11-11は欠けている
+                ["tasks_20251110-20251110.csv", "tasks_20251112-20251112.csv"],
+                _NOV_10,
+                _NOV_12,
+                [_NOV_10, _NOV_12],
+                [_NOV_11],
+                id="some_missing",
+            ),
+            pytest.param(
+                [],
+                _NOV_10,
+                _NOV_12,
+                [],
+                [_NOV_10, _NOV_11, _NOV_12],
+                id="all_missing",
+            ),
+            pytest.param(
+                # 3日分を1つの範囲ファイルでカバー
+                ["tasks_20251111-20251113.csv"],
+                _NOV_11,
+                _NOV_13,
+                [_NOV_11, _NOV_12, _NOV_13],
+                [],
+                id="range_file",
+            ),
+            pytest.param(
+                # 範囲ファイルは11-12日のみカバー
+                ["tasks_20251111-20251112.csv"],
+                _NOV_10,
+                _NOV_13,
+                [_NOV_11, _NOV_12],
+                [_NOV_10, _NOV_13],
+                id="partial_range_coverage",
+            ),
+        ],
+    )
+    def test_check_existing_files(
+        self,
+        exporter: TaskChuteExporter,
+        temp_download_dir: Path,
+        filenames: list[str],
+        start_date: date,
+        end_date: date,
+        expected_existing: list[date],
+        expected_missing: list[date],
+    ):
+        """check_existing_files: 既存ファイルでカバーされる日付と欠けている日付を返す."""
+        _touch_many(temp_download_dir, filenames)
 
         existing_dates, missing_dates = exporter.check_existing_files(start_date, end_date)
 
-        assert len(existing_dates) == 2
-        assert len(missing_dates) == 1
-        assert existing_dates == [date(2025, 11, 10), date(2025, 11, 12)]
-        assert missing_dates == [date(2025, 11, 11)]
-
-    def test_check_existing_files_all_missing(self, temp_download_dir: Path):
-        """_check_existing_files: 全てのファイルが欠けている場合."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        start_date = date(2025, 11, 10)
-        end_date = date(2025, 11, 12)
-
-        existing_dates, missing_dates = exporter.check_existing_files(start_date, end_date)
+        assert existing_dates == expected_existing
+        assert missing_dates == expected_missing
 
-        assert len(existing_dates) == 0
-        assert len(missing_dates) == 3
-        assert missing_dates == [date(2025, 11, 10), date(2025, 11, 11), date(2025, 11, 12)]
+    def test_plan_export_returns_missing_ranges(self, temp_download_dir: Path):
+        """plan_export: ブラウザなしで欠けている日付範囲を返す."""
+        (temp_download_dir / "tasks_20251111-20251112.csv").touch()
 
-    def test_check_existing_files_with_range_file(self, temp_download_dir: Path):
-        """check_existing_files: 範囲ファイルが存在する場合."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        start_date = date(2025, 11, 11)
-        end_date = date(2025, 11, 13)
+        ranges = TaskChuteExporter.plan_export(temp_download_dir, _NOV_10, _NOV_14)
 
-        # 範囲ファイルを作成（3日分を1つのファイルに）
-        (temp_download_dir / "tasks_20251111-20251113.csv").touch()
+        assert ranges == [
+            (_NOV_10, _NOV_10),
+            (_NOV_13, _NOV_14),
+        ]
 
-        existing_dates, missing_dates = exporter.check_existing_files(start_date, end_date)
+    def test_plan_export_missing_dir(self, tmp_path: Path):
+        """plan_export: ディレクトリを作成せず、存在しない場合は全範囲を返す."""
+        download_dir = tmp_path / "missing"
 
-        assert len(existing_dates) == 3
-        assert len(missing_dates) == 0
-        assert existing_dates == [date(2025, 11, 11), date(2025, 11, 12), date(2025, 11, 13)]
+        ranges = TaskChuteExporter.plan_export(download_dir, _NOV_10, _NOV_14)
 
-    def test_check_existing_files_partial_range_coverage(self, temp_download_dir: Path):
-        """check_existing_files: 範囲ファイルが一部の日付をカバーしている場合."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        start_date = date(2025, 11, 10)
-        end_date = date(2025, 11, 13)
+        assert ranges == [(_NOV_10, _NOV_14)]
+        assert not download_dir.exists()
 
-        # 範囲ファイルを作成（11-12日のみ）
-        (temp_download_dir / "tasks_20251111-20251112.csv").touch()
+    def test_plan_export_all_covered(self, temp_download_dir: Path):
+        """plan_export: 全ての日付がカバーされている場合、空のリストを返す."""
+        (temp_download_dir / "tasks_20251110-20251114.csv").touch()
 
-        existing_dates, missing_dates = exporter.check_existing_files(start_date, end_date)
+        ranges = TaskChuteExporter.plan_export(temp_download_dir, _NOV_10, _NOV_14)
 
-        assert len(existing_dates) == 2
-        assert len(missing_dates) == 2
-        assert existing_dates == [date(2025, 11, 11), date(2025, 11, 12)]
-        assert missing_dates == [date(2025, 11, 10), date(2025, 11, 13)]
+        assert ranges == []
 
-    def test_parse_filename_date_range(self, temp_download_dir: Path):
+    def test_parse_filename_date_range(self, exporter: TaskChuteExporter):
         """_parse_filename_date_range: ファイル名から日付範囲を正しく抽出."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-
         # 単一日付
         start, end = exporter._parse_filename_date_range("tasks_20251110-20251110.csv")
-        assert start == date(2025, 11, 10)
-        assert end == date(2025, 11, 10)
+        assert start == _NOV_10
+        assert end == _NOV_10
 
         # 範囲日付
         start, end = exporter._parse_filename_date_range("tasks_20251111-20251113.csv")
-        assert start == date(2025, 11, 11)
-        assert end == date(2025, 11, 13)
+        assert start == _NOV_11
+        assert end == _NOV_13
 
         # 無効なファイル名
         start, end = exporter._parse_filename_date_range("invalid.csv")
         assert start is None
         assert end is None
 
-    def test_group_consecutive_dates_single_range(self, temp_download_dir: Path):
-        """_group_consecutive_dates: 連続する日付が1つの範囲にグループ化される."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        dates = [date(2025, 11, 10), date(2025, 11, 11), date(2025, 11, 12)]
-
-        result = exporter._group_consecutive_dates(dates)
-
-        assert len(result) == 1
-        assert result[0] == (date(2025, 11, 10), date(2025, 11, 12))
-
-    def test_group_consecutive_dates_multiple_ranges(self, temp_download_dir: Path):
-        """_group_consecutive_dates: 連続しない日付が複数の範囲にグループ化される."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        dates = [date(2025, 11, 10), date(2025, 11, 11), date(2025, 11, 13), date(2025, 11, 14)]
-
-        result = exporter._group_consecutive_dates(dates)
-
-        assert len(result) == 2
-        assert result[0] == (date(2025, 11, 10), date(2025, 11, 11))
-        assert result[1] == (date(2025, 11, 13), date(2025, 11, 14))
-
-    def test_group_consecutive_dates_single_date(self, temp_download_dir: Path):
-        """_group_consecutive_dates: 単一の日付が1つの範囲にグループ化される."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        dates = [date(2025, 11, 10)]
-
-        result = exporter._group_consecutive_dates(dates)
-
-        assert len(result) == 1
-        assert result[0] == (date(2025, 11, 10), date(2025, 11, 10))
-
-    def test_group_consecutive_dates_empty(self, temp_download_dir: Path):
-        """_group_consecutive_dates: 空のリストが空の範囲リストを返す."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        dates = []
+    @pytest.mark.parametrize(
+        ("dates", "expected"),
+        [
+            pytest.param(
+                [_NOV_10, _NOV_11, _NOV_12],
+                [(_NOV_10, _NOV_12)],
+                id="single_range",
+            ),
+            pytest.param(
+                [_NOV_10, _NOV_11, _NOV_13, _NOV_14],
+                [
+                    (_NOV_10, _NOV_11),
+                    (_NOV_13, _NOV_14),
+                ],
+                id="multiple_ranges",
+            ),
+            pytest.param(
+                [_NOV_10],
+                [(_NOV_10, _NOV_10)],
+                id="single_date",
+            ),
+            pytest.param(
+                [date(2025, 12, 1), date(2025, 11, 30), date(2025, 11, 30), date(2025, 12, 3)],
+                [
+                    (date(2025, 11, 30), date(2025, 12, 1)),
+                    (date(2025, 12, 3), date(2025, 12, 3)),
+                ],
+                id="unsorted_with_duplicates",
+            ),
+            pytest.param([], [], id="empty"),
+        ],
+    )
+    def test_group_consecutive_dates(
+        self,
+        exporter: TaskChuteExporter,
+        dates: list[date],
+        expected: list[tuple[date, date]],
+    ):
+        """_group_consecutive_dates: 連続する日付を範囲にグループ化する."""
+        assert exporter._group_consecutive_dates(dates) == expected
 
-        result = exporter._group_consecutive_dates(dates)
+    def test_group_consecutive_dates_assume_sorted(
+        self, exporter: TaskChuteExporter, temp_download_dir: Path
+    ):
+        """_group_consecutive_dates: assume_sorted=Trueでもソート時と同じ範囲を返す."""
+        (temp_download_dir / "tasks_20251112-20251112.csv").touch()
+        _, missing = exporter.check_existing_files(_NOV_10, _NOV_14)
 
-        assert len(result) == 0
+        assert exporter._group_consecutive_dates(
+            missing, assume_sorted=True
+        ) == exporter._group_consecutive_dates(missing)
 
     def test_export_data_all_files_exist_skip(
-        self, mock_page: Mock, temp_download_dir: Path, capsys
+        self, exporter: TaskChuteExporter, mock_page: Mock, temp_download_dir: Path, caplog
     ):
         """export_data: 全てのファイルが存在する場合、エクスポートをスキップ."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        start_date = date(2025, 11, 10)
-        end_date = date(2025, 11, 10)
+        caplog.set_level(logging.INFO, logger="tccretro.export")
+        start_date = _NOV_10
+        end_date = _NOV_10
 
         # ファイルを作成
         existing_file = temp_download_dir / "tasks_20251110-20251110.csv"
@@ -443,76 +561,96 @@ class TestTaskChuteExporter:
         assert result == str(existing_file)
         # エクスポート処理が呼ばれていないことを確認
         mock_page.goto.assert_not_called()
-        captured = capsys.readouterr()
-        assert "全ての日付のファイルが既に存在します" in captured.out
-        assert "スキップします" in captured.out
+        assert "全ての日付のファイルが既に存在します" in caplog.text
+        assert "スキップします" in caplog.text
 
     def test_export_data_some_files_missing_partial_export(
-        self, mock_page: Mock, mock_locator: Mock, mock_download: Mock, temp_download_dir: Path, capsys
+        self,
+        exporter: TaskChuteExporter,
+        mock_page: Mock,
+        mock_locator: Mock,
+        mock_download: Mock,
+        temp_download_dir: Path,
+        caplog,
     ):
         """export_data: 一部のファイルが欠けている場合、欠けている日付のみエクスポート."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        start_date = date(2025, 11, 10)
-        end_date = date(2025, 11, 12)
+        caplog.set_level(logging.INFO, logger="tccretro.export")
+        start_date = _NOV_10
+        end_date = _NOV_12
 
-        # 一部のファイルのみ作成
-        (temp_download_dir / "tasks_20251110-20251110.csv").touch()
-        # 2025-11-11は欠けている
-        (temp_download_dir / "tasks_20251112-20251112.csv").touch()
+        # 一部のファイルのみ作成 (2025-11-11は欠けている)
+        _touch_many(
+            temp_download_dir, ["tasks_20251110-20251110.csv", "tasks_20251112-20251112.csv"]
+        )
 
         # fill_date_rangeとエクスポート処理をモック化
-        with patch.object(exporter, "_export_date_range", return_value=str(temp_download_dir / "tasks_20251111-20251111.csv")):
-            result = exporter.export_data(mock_page, start_date, end_date)
+        exporter._download_for_range = Mock(
+            return_value=str(temp_download_dir / "tasks_20251111-20251111.csv")
+        )
+        result = exporter.export_data(mock_page, start_date, end_date)
 
-            assert result is not None
-            assert "tasks_20251111-20251111.csv" in result
-            # 欠けている日付のみエクスポートされることを確認
-            exporter._export_date_range.assert_called_once_with(mock_page, date(2025, 11, 11), date(2025, 11, 11))
-            captured = capsys.readouterr()
-            assert "既存ファイルが見つかりました" in captured.out
-            assert "欠けている日付のみをエクスポートします" in captured.out
+        assert result is not None
+        assert "tasks_20251111-20251111.csv" in result
+        # 欠けている日付のみエクスポートされることを確認
+        exporter._download_for_range.assert_called_once_with(mock_page, _NOV_11, _NOV_11)
+        assert "既存ファイルが見つかりました" in caplog.text
+        assert "欠けている日付のみをエクスポートします" in caplog.text
 
     def test_export_data_all_files_missing_normal_export(
-        self, mock_page: Mock, mock_locator: Mock, mock_download: Mock, temp_download_dir: Path
+        self,
+        exporter: TaskChuteExporter,
+        mock_page: Mock,
+        mock_locator: Mock,
+        mock_download: Mock,
+        temp_download_dir: Path,
     ):
         """export_data: 全てのファイルが欠けている場合、通常通りエクスポート."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        start_date = date(2025, 11, 10)
-        end_date = date(2025, 11, 10)
+        start_date = _NOV_10
+        end_date = _NOV_10
 
         # fill_date_rangeとエクスポート処理をモック化
-        with patch.object(exporter, "_export_date_range", return_value=str(temp_download_dir / "tasks_20251110-20251110.csv")):
-            result = exporter.export_data(mock_page, start_date, end_date)
+        exporter._download_for_range = Mock(
+            return_value=str(temp_download_dir / "tasks_20251110-20251110.csv")
+        )
+        result = exporter.export_data(mock_page, start_date, end_date)
 
-            assert result is not None
-            # 通常通りエクスポートされることを確認
-            exporter._export_date_range.assert_called_once_with(mock_page, start_date, end_date)
+        assert result is not None
+        # 通常通りエクスポートされることを確認
+        exporter._download_for_range.assert_called_once_with(mock_page, start_date, end_date)
 
     def test_export_data_multiple_missing_ranges(
-        self, mock_page: Mock, temp_download_dir: Path
+        self, exporter: TaskChuteExporter, mock_page: Mock, temp_download_dir: Path
     ):
         """export_data: 複数の連続しない範囲が欠けている場合、各範囲を個別にエクスポート."""
-        exporter = TaskChuteExporter(download_dir=str(temp_download_dir))
-        start_date = date(2025, 11, 10)
-        end_date = date(2025, 11, 14)
+        start_date = _NOV_10
+        end_date = _NOV_14
 
         # 一部のファイルのみ作成（2025-11-10, 2025-11-12, 2025-11-14は存在）
-        (temp_download_dir / "tasks_20251110-20251110.csv").touch()
-        (temp_download_dir / "tasks_20251112-20251112.csv").touch()
-        (temp_download_dir / "tasks_20251114-20251114.csv").touch()
+        _touch_many(
+            temp_download_dir,
+            [
+                "tasks_20251110-20251110.csv",
+                "tasks_20251112-20251112.csv",
+                "tasks_20251114-20251114.csv",
+            ],
+        )
         # 2025-11-11と2025-11-13が欠けている
 
         # fill_date_rangeとエクスポート処理をモック化
-        with patch.object(exporter, "_export_date_range") as mock_export:
-            mock_export.side_effect = [
+        mock_export = Mock(
+            side_effect=[
                 str(temp_download_dir / "tasks_20251111-20251111.csv"),
                 str(temp_download_dir / "tasks_20251113-20251113.csv"),
             ]
+        )
+        exporter._download_for_range = mock_export
 
-            result = exporter.export_data(mock_page, start_date, end_date)
+        result = exporter.export_data(mock_page, start_date, end_date)
 
-            assert result is not None
-            # 2つの範囲が個別にエクスポートされることを確認
-            assert mock_export.call_count == 2
-            mock_export.assert_any_call(mock_page, date(2025, 11, 11), date(2025, 11, 11))
-            mock_export.assert_any_call(mock_page, date(2025, 11, 13), date(2025, 11, 13))
+        assert result is not None
+        # 2つの範囲が個別にエクスポートされることを確認
+        assert mock_export.call_count == 2
+        mock_export.assert_any_call(mock_page, _NOV_11, _NOV_11)
+        mock_export.assert_any_call(mock_page, _NOV_13, _NOV_13)
+        # エクスポートページへの移動は一度だけ
+        mock_page.goto.assert_called_once()
@@ -1,302 +1,324 @@
 """login.pyモジュールのテスト."""
 
+import os
+import time
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from tccretro.login import TaskChuteLogin, create_login_from_env
 
+# テスト用の認証情報
+_EMAIL = "test@example.com"
+_PASSWORD = "test_password"
+# ログイン済みのアプリ画面と認証画面のURL
+_APP_URL = "https://taskchute.cloud/taskchute"
+_AUTH_URL = "https://taskchute.cloud/auth/login"
 
-class TestTaskChuteLogin:
-    """TaskChuteLoginクラスのテストスイート."""
-
-    def test_init(self):
-        """__init__: 初期化時に認証情報が正しく設定されることを確認."""
-        email = "test@example.com"
-        password = "test_password"
-
-        login = TaskChuteLogin(email, password)
-
-        assert login.google_email == email
-        assert login.google_password == password
-        assert login.base_url == "https://taskchute.cloud"
-
-    def test_login_success_already_logged_in(self, mock_page: Mock):
-        """login: すでにログイン済みの場合、Trueを返す."""
-        login = TaskChuteLogin("test@example.com", "test_password")
-
-        # ログイン済みURLをモック
-        mock_page.url = "https://taskchute.cloud/taskchute"
-
-        result = login.login(mock_page)
-
-        assert result is True
-        mock_page.goto.assert_called_once_with("https://taskchute.cloud/taskchute")
-        mock_page.wait_for_load_state.assert_called_once_with("domcontentloaded")
-
-    def test_login_failure_not_logged_in(self, mock_page: Mock):
-        """login: ログインが必要な場合、Falseを返す."""
-        login = TaskChuteLogin("test@example.com", "test_password")
-
-        # ログインページのURLをモック
-        mock_page.url = "https://taskchute.cloud/auth/login"
-        # ログインボタンが見つかる場合（未ログイン）
-        mock_page.wait_for_selector.return_value = True
-
-        result = login.login(mock_page)
-
-        assert result is False
-
-    def test_login_wait_for_manual_login_timeout(self, mock_page: Mock, monkeypatch):
-        """login: wait_for_manual_login=Trueでタイムアウトする場合、Falseを返す."""
-        import time
-
-        login = TaskChuteLogin("test@example.com", "test_password")
-
-        # ログインページのURLをモック（未ログイン状態）
-        mock_page.url = "https://taskchute.cloud/auth/login"
-        mock_page.title.return_value = "TaskChute Cloud - Login"
-        # ログインボタンが見つかる場合（未ログイン）
-        mock_page.wait_for_selector.return_value = True
-
-        # 時間をモックしてタイムアウトをシミュレート
-        start_time = 1000.0
-        call_count = 0
-
-        def mock_time():
-            nonlocal call_count
-            call_count += 1
-            # 最初の呼び出しでstart_timeを返し、その後2秒ごとに時間を進める
-            if call_count == 1:
-                return start_time
-            # 2回目以降は2秒ずつ進む（call_count-1で調整）
-            return start_time + ((call_count - 1) * 2)
-
-        monkeypatch.setattr(time, "time", mock_time)
-
-        # 短いタイムアウトでテスト（3秒、ループが実行されるように）
-        result = login.login(mock_page, wait_for_manual_login=True, manual_timeout_sec=3)
-
-        assert result is False
-        # wait_for_timeoutが呼ばれていることを確認（少なくとも1回は呼ばれる）
-        assert mock_page.wait_for_timeout.call_count > 0
-
-    def test_login_wait_for_manual_login_success(self, mock_page: Mock, monkeypatch):
-        """login: wait_for_manual_login=Trueでログイン成功する場合、Trueを返す."""
-        import time
 
-        login = TaskChuteLogin("test@example.com", "test_password")
+@pytest.fixture(scope="module")
+def login() -> TaskChuteLogin:
+    """状態を持たない (キャッシュ無効の) ログインインスタンスをモジュールで共有する."""
+    return TaskChuteLogin(_EMAIL, _PASSWORD)
 
-        # 最初は未ログイン、その後ログイン済みになる
-        call_count = 0
 
-        def mock_is_logged_in(page):
-            nonlocal call_count
-            call_count += 1
-            # 2回目の呼び出しでログイン済みになる
-            if call_count == 1:
-                return False
-            return True
+@pytest.fixture
+def wait_harness(
+    login: TaskChuteLogin, mock_page: Mock, monkeypatch: pytest.MonkeyPatch
+) -> SimpleNamespace:
+    """手動ログイン待機のテスト用に、ページと_is_logged_in()のモックを準備する.
 
-        monkeypatch.setattr(login, "_is_logged_in", mock_is_logged_in)
+    _is_logged_in() は既定で未ログイン (False) を返す。run(timeout) で
+    wait_for_manual_login=True の login() を実行する。
+    単調時計は実時間から切り離し、expire を待機メソッドの side_effect に設定すると
+    渡された timeout 分だけ時計を進めてから PlaywrightTimeoutError を送出する。
+    """
+    clock = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    is_logged_in = Mock(return_value=False)
+    monkeypatch.setattr(login, "_is_logged_in", is_logged_in)
+    mock_page.title.return_value = "TaskChute Cloud"
 
-        # ログインページのURLをモック
-        mock_page.url = "https://taskchute.cloud/auth/login"
-        mock_page.title.return_value = "TaskChute Cloud - Login"
+    def expire(*args, timeout: float, **kwargs) -> None:
+        clock[0] += timeout / 1000
+        raise PlaywrightTimeoutError("Timeout")
 
-        # 時間をモック
-        start_time = 1000.0
-        time_call_count = 0
+    def run(timeout: int) -> bool:
+        return login.login(mock_page, wait_for_manual_login=True, manual_timeout_sec=timeout)
 
-        def mock_time():
-            nonlocal time_call_count
-            time_call_count += 1
-            return start_time + (time_call_count * 2)
+    return SimpleNamespace(page=mock_page, is_logged_in=is_logged_in, expire=expire, run=run)
 
-        monkeypatch.setattr(time, "time", mock_time)
 
-        result = login.login(mock_page, wait_for_manual_login=True, manual_timeout_sec=300)
+class TestTaskChuteLogin:
+    """TaskChuteLoginクラスのテストスイート."""
 
-        assert result is True
-        # wait_for_timeoutが呼ばれていることを確認
-        assert mock_page.wait_for_timeout.call_count > 0
+    def test_init(self):
+        """__init__: 初期化時に認証情報が正しく設定されることを確認."""
+        login = TaskChuteLogin(_EMAIL, _PASSWORD)
 
-    def test_login_backward_compatibility(self, mock_page: Mock):
-        """login: 既存の呼び出し方法（引数なし）が後方互換性を保つことを確認."""
-        login = TaskChuteLogin("test@example.com", "test_password")
+        assert login.google_email == _EMAIL
+        assert login.google_password == _PASSWORD
+        assert login.base_url == "https://taskchute.cloud"
 
-        # ログイン済みURLをモック
-        mock_page.url = "https://taskchute.cloud/taskchute"
+    @pytest.mark.parametrize(
+        ("url", "selector_result", "expected"),
+        [
+            # すでにログイン済み (ログインボタンが見つからない)
+            pytest.param(_APP_URL, Exception("Timeout"), True, id="already_logged_in"),
+            # ログインが必要 (アプリ画面でログインボタンが見つかる)
+            pytest.param(_APP_URL, None, False, id="login_button_shown"),
+            # ログインが必要 (認証画面にリダイレクトされた)
+            pytest.param(_AUTH_URL, None, False, id="auth_url"),
+        ],
+    )
+    def test_login_checks_login_state(
+        self,
+        login: TaskChuteLogin,
+        mock_page: Mock,
+        url: str,
+        selector_result: object,
+        expected: bool,
+    ):
+        """login: 引数なしの呼び出しでログイン状態を確認し、結果を返す."""
+        mock_page.url = url
+        mock_page.wait_for_selector.side_effect = [selector_result]
 
-        # 引数なしで呼び出し（既存のコード）
         result = login.login(mock_page)
 
-        assert result is True
+        assert result is expected
+        mock_page.goto.assert_called_once_with(_APP_URL)
+        mock_page.wait_for_load_state.assert_called_once_with("domcontentloaded")
 
-    def test_login_exception_handling(self, mock_page: Mock, capsys):
+    @pytest.mark.timeout(5)
+    def test_login_wait_for_manual_login_timeout(self, wait_harness: SimpleNamespace):
+        """login: wait_for_manual_login=Trueでタイムアウトする場合、Falseを返す."""
+        mock_page = wait_harness.page
+        # ログインページのURLをモック（未ログイン状態）
+        mock_page.url = _AUTH_URL
+        # アプリ画面への遷移が起きずにタイムアウト
+        mock_page.wait_for_url.side_effect = wait_harness.expire
+
+        assert wait_harness.run(3) is False
+        mock_page.wait_for_url.assert_called_once()
+        # 再確認の間隔より短い残り時間 (3秒) はそのまま待機時間として渡す
+        assert mock_page.wait_for_url.call_args.kwargs["timeout"] == 3000
+        # 固定間隔のポーリングは行わない
+        mock_page.wait_for_timeout.assert_not_called()
+        # 進捗表示用のリスナーは解除される
+        mock_page.remove_listener.assert_called_once()
+
+    @pytest.mark.timeout(5)
+    def test_login_wait_for_manual_login_success(self, wait_harness: SimpleNamespace):
+        """login: wait_for_manual_login=Trueでログイン成功する場合、Trueを返す."""
+        mock_page = wait_harness.page
+        # ログインページのURLをモック、アプリ画面への遷移後はログイン済み
+        mock_page.url = _AUTH_URL
+        wait_harness.is_logged_in.return_value = True
+
+        assert wait_harness.run(300) is True
+        # URL遷移を再確認の間隔 (30秒) で区切って待機し、固定間隔のポーリングは行わない
+        mock_page.wait_for_url.assert_called_once()
+        assert mock_page.wait_for_url.call_args.kwargs["timeout"] == 30_000
+        mock_page.wait_for_timeout.assert_not_called()
+
+    @pytest.mark.timeout(5)
+    def test_login_wait_for_manual_login_detects_button_detached(
+        self, wait_harness: SimpleNamespace
+    ):
+        """login: アプリ画面でログインボタンが消えた場合、ページ遷移なしでログインを検出する."""
+        mock_page = wait_harness.page
+        # アプリ画面への遷移時はログインボタンが表示中、ボタンの消失後はログイン済み
+        mock_page.url = _APP_URL
+        wait_harness.is_logged_in.side_effect = [False, True]
+
+        assert wait_harness.run(300) is True
+        mock_page.wait_for_selector.assert_called_once_with(
+            'button:has-text("LOGIN WITH")', state="detached", timeout=30_000
+        )
+
+    @pytest.mark.timeout(5)
+    def test_login_wait_for_manual_login_reports_progress(
+        self, wait_harness: SimpleNamespace, capsys: pytest.CaptureFixture[str]
+    ):
+        """login: 手動ログイン待機中は、再確認の間隔ごとに残り時間を表示する."""
+        mock_page = wait_harness.page
+        mock_page.url = _AUTH_URL
+        mock_page.wait_for_url.side_effect = wait_harness.expire
+
+        assert wait_harness.run(60) is False
+        assert mock_page.wait_for_url.call_count == 2
+        assert "待機中... (残り約30秒)" in capsys.readouterr().out
+
+    def test_login_exception_handling(
+        self, login: TaskChuteLogin, mock_page: Mock, caplog: pytest.LogCaptureFixture
+    ):
         """login: 例外が発生した場合、Falseを返しエラーメッセージを表示."""
-        login = TaskChuteLogin("test@example.com", "test_password")
-
         # gotoで例外を発生させる
         mock_page.goto.side_effect = Exception("Network error")
 
         result = login.login(mock_page)
 
         assert result is False
-        captured = capsys.readouterr()
-        assert "エラー: Network error" in captured.out
+        assert "エラー: Network error" in caplog.text
 
-    def test_is_logged_in_taskchute_url_without_auth(self, mock_page: Mock):
-        """_is_logged_in: /taskchute URLで /auth/ がない場合、ログイン済みと判定."""
-        login = TaskChuteLogin("test@example.com", "test_password")
-        mock_page.url = "https://taskchute.cloud/taskchute"
+    def test_login_skips_navigation_when_cache_fresh(self, mock_page: Mock, tmp_path):
+        """login: ログイン状態キャッシュが有効な場合、ページ遷移せずTrueを返す."""
+        (tmp_path / "login_ok.ts").touch()
+        login = TaskChuteLogin(_EMAIL, _PASSWORD, state_dir=tmp_path)
 
-        result = login._is_logged_in(mock_page)
+        result = login.login(mock_page)
 
         assert result is True
+        mock_page.goto.assert_not_called()
 
-    def test_is_logged_in_auth_url(self, mock_page: Mock):
-        """_is_logged_in: /auth/ を含むURLの場合、ログインボタンの有無で判定."""
-        login = TaskChuteLogin("test@example.com", "test_password")
-        mock_page.url = "https://taskchute.cloud/auth/login"
-
-        # ログインボタンが見つかる場合（未ログイン）
-        mock_page.wait_for_selector.return_value = True
-
-        result = login._is_logged_in(mock_page)
-
-        assert result is False
-        mock_page.wait_for_selector.assert_called_once()
-
-    def test_is_logged_in_no_login_button(self, mock_page: Mock):
-        """_is_logged_in: ログインボタンが見つからない場合でも、/taskchuteでなければ未ログインと判定（保守的）."""
-        login = TaskChuteLogin("test@example.com", "test_password")
-        mock_page.url = "https://taskchute.cloud/some-page"
-
-        # ログインボタンが見つからない（タイムアウト）
-        mock_page.wait_for_selector.side_effect = Exception("Timeout")
-
-        result = login._is_logged_in(mock_page)
+    def test_login_updates_cache(self, mock_page: Mock, tmp_path):
+        """login: ログイン確認結果に応じてキャッシュを作成・削除する."""
+        cache_path = tmp_path / "login_ok.ts"
+        login = TaskChuteLogin(_EMAIL, _PASSWORD, state_dir=tmp_path)
 
-        # 保守的な判定: /taskchuteでない場合はFalseを返す
-        assert result is False
-
-    def test_is_logged_in_no_login_button_but_taskchute_url(self, mock_page: Mock):
-        """_is_logged_in: ログインボタンが見つからないが/taskchute URLの場合、ログイン済みと判定."""
-        login = TaskChuteLogin("test@example.com", "test_password")
-        mock_page.url = "https://taskchute.cloud/taskchute"
-
-        # ログインボタンが見つからない（タイムアウト）
+        # ログイン済み: キャッシュを作成
+        mock_page.url = _APP_URL
         mock_page.wait_for_selector.side_effect = Exception("Timeout")
-
-        result = login._is_logged_in(mock_page)
-
-        # /taskchute URLでログインボタンがない場合、ログイン済みと判定
-        assert result is True
-
-    def test_login_wait_for_manual_login_skips_initial_check(self, mock_page: Mock, monkeypatch):
+        assert login.login(mock_page) is True
+        assert cache_path.exists()
+
+        # 期限切れのキャッシュで未ログインを検出: キャッシュを削除
+        os.utime(cache_path, (0, 0))
+        mock_page.url = _AUTH_URL
+        assert login.login(mock_page) is False
+        assert not cache_path.exists()
+
+    def test_invalidate_login_cache(self, mock_page: Mock, tmp_path):
+        """invalidate_login_cache: 有効なキャッシュを破棄し、次回は実際に確認する."""
+        cache_path = tmp_path / "login_ok.ts"
+        cache_path.touch()
+        login = TaskChuteLogin(_EMAIL, _PASSWORD, state_dir=tmp_path)
+
+        login.invalidate_login_cache()
+
+        assert not cache_path.exists()
+        mock_page.url = _AUTH_URL
+        assert login.login(mock_page) is False
+        mock_page.goto.assert_called_once()
+
+    @pytest.mark.parametrize(
+        ("url", "selector_result", "expected"),
+        [
+            # /taskchute URLでログインボタンが見つからない場合、ログイン済み
+            pytest.param(_APP_URL, Exception("Timeout"), True, id="app_url_without_login_button"),
+            # /taskchute URLでもログインボタンが見つかる場合、未ログイン
+            pytest.param(_APP_URL, None, False, id="app_url_with_login_button"),
+            # /auth/ を含むURLの場合、未ログイン
+            pytest.param(_AUTH_URL, None, False, id="auth_url"),
+            # ログインボタンが見つからなくても、/taskchuteでなければ未ログイン (保守的)
+            pytest.param(
+                "https://taskchute.cloud/some-page",
+                Exception("Timeout"),
+                False,
+                id="non_taskchute_path_without_login_button",
+            ),
+        ],
+    )
+    def test_is_logged_in(
+        self,
+        login: TaskChuteLogin,
+        mock_page: Mock,
+        url: str,
+        selector_result: object,
+        expected: bool,
+    ):
+        """_is_logged_in: URLとログインボタンの有無からログイン状態を判定."""
+        mock_page.url = url
+        # 例外はログインボタンが見つからない (タイムアウト)、Noneは見つかったことを表す
+        mock_page.wait_for_selector.side_effect = [selector_result]
+
+        assert login._is_logged_in(mock_page) is expected
+
+    def test_is_logged_in_auth_url_skips_login_button_check(
+        self, login: TaskChuteLogin, mock_page: Mock
+    ):
+        """_is_logged_in: /auth/ を含むURLの場合、ログインボタンを探さずに未ログインと判定."""
+        mock_page.url = _AUTH_URL
+
+        assert login._is_logged_in(mock_page) is False
+        mock_page.wait_for_selector.assert_not_called()
+
+    @pytest.mark.timeout(5)
+    def test_login_wait_for_manual_login_skips_initial_check(self, wait_harness: SimpleNamespace):
         """login: wait_for_manual_login=Trueの場合、初回_is_logged_in()チェックをスキップして待機に入る."""
-        import time
-
-        login = TaskChuteLogin("test@example.com", "test_password")
-
-        # _is_logged_in()が呼ばれた回数を追跡
-        is_logged_in_call_count = 0
-
-        def mock_is_logged_in(page):
-            nonlocal is_logged_in_call_count
-            is_logged_in_call_count += 1
-            # 待機ループ内での呼び出しではFalseを返す（ログイン待ち）
-            return False
-
-        monkeypatch.setattr(login, "_is_logged_in", mock_is_logged_in)
-
-        # ログインページのURLをモック
-        mock_page.url = "https://taskchute.cloud/taskchute"
-        mock_page.title.return_value = "TaskChute Cloud"
-
-        # 時間をモックして短いタイムアウトでテスト
-        start_time = 1000.0
-        time_call_count = 0
-
-        def mock_time():
-            nonlocal time_call_count
-            time_call_count += 1
-            # 最初の呼び出しでstart_timeを返し、その後2秒ごとに時間を進める
-            if time_call_count == 1:
-                return start_time
-            return start_time + ((time_call_count - 1) * 2)
-
-        monkeypatch.setattr(time, "time", mock_time)
-
-        # 短いタイムアウトでテスト（3秒、ループが実行されるように）
-        result = login.login(mock_page, wait_for_manual_login=True, manual_timeout_sec=3)
+        mock_page = wait_harness.page
+        # URL遷移後もログインボタンが表示されている（ログイン待ち）
+        mock_page.url = _APP_URL
+        # ログインボタンが消えずにタイムアウト
+        mock_page.wait_for_selector.side_effect = wait_harness.expire
 
         # タイムアウトでFalseを返す
-        assert result is False
-        # 初回チェックをスキップしているため、_is_logged_in()は待機ループ内でのみ呼ばれる
-        # 待機ループは2秒ごとに実行されるため、3秒のタイムアウトでは少なくとも1回は呼ばれる
-        assert is_logged_in_call_count > 0
-        # wait_for_timeoutが呼ばれていることを確認
-        assert mock_page.wait_for_timeout.call_count > 0
+        assert wait_harness.run(3) is False
+        # 初回チェックをスキップしているため、_is_logged_in()はURL遷移の待機後にのみ呼ばれる
+        wait_harness.is_logged_in.assert_called_once_with(mock_page)
+        mock_page.wait_for_selector.assert_called_once_with(
+            'button:has-text("LOGIN WITH")', state="detached", timeout=3000
+        )
 
 
 class TestCreateLoginFromEnv:
     """create_login_from_env関数のテストスイート."""
 
-    def test_create_from_new_env_vars(self, mock_env: dict[str, str]):
-        """create_login_from_env: 新しい環境変数から正しく作成."""
-        login = create_login_from_env()
-
-        assert login.google_email == "test@example.com"
-        assert login.google_password == "test_password"
-
-    def test_create_from_legacy_env_vars(self, monkeypatch: pytest.MonkeyPatch):
-        """create_login_from_env: 古い環境変数からフォールバック."""
-        monkeypatch.setenv("TASKCHUTE_USERNAME", "legacy@example.com")
-        monkeypatch.setenv("TASKCHUTE_PASSWORD", "legacy_password")
-
-        login = create_login_from_env()
-
-        assert login.google_email == "legacy@example.com"
-        assert login.google_password == "legacy_password"
-
-    def test_create_with_new_overrides_legacy(self, monkeypatch: pytest.MonkeyPatch):
-        """create_login_from_env: 新しい環境変数が古い環境変数より優先される."""
-        monkeypatch.setenv("TASKCHUTE_GOOGLE_EMAIL", "new@example.com")
-        monkeypatch.setenv("TASKCHUTE_GOOGLE_PASSWORD", "new_password")
-        monkeypatch.setenv("TASKCHUTE_USERNAME", "legacy@example.com")
-        monkeypatch.setenv("TASKCHUTE_PASSWORD", "legacy_password")
-
-        login = create_login_from_env()
-
-        assert login.google_email == "new@example.com"
-        assert login.google_password == "new_password"
-
-    def test_create_with_no_env_vars(self, monkeypatch: pytest.MonkeyPatch):
-        """create_login_from_env: 環境変数がない場合、デフォルト値を使用."""
-        # すべての関連環境変数を削除
-        for key in [
-            "TASKCHUTE_GOOGLE_EMAIL",
-            "TASKCHUTE_GOOGLE_PASSWORD",
-            "TASKCHUTE_USERNAME",
-            "TASKCHUTE_PASSWORD",
-        ]:
-            monkeypatch.delenv(key, raising=False)
-
-        login = create_login_from_env()
-
-        assert login.google_email == "manual-login"
-        assert login.google_password == "manual-login"
-
-    def test_create_with_partial_env_vars(self, monkeypatch: pytest.MonkeyPatch):
-        """create_login_from_env: 部分的な環境変数の場合、デフォルト値で補完."""
-        monkeypatch.setenv("TASKCHUTE_GOOGLE_EMAIL", "partial@example.com")
-        monkeypatch.delenv("TASKCHUTE_GOOGLE_PASSWORD", raising=False)
-        monkeypatch.delenv("TASKCHUTE_USERNAME", raising=False)
-        monkeypatch.delenv("TASKCHUTE_PASSWORD", raising=False)
+    @pytest.mark.parametrize(
+        ("env", "expected_email", "expected_password"),
+        [
+            # 新しい環境変数から正しく作成
+            pytest.param(
+                {"TASKCHUTE_GOOGLE_EMAIL": _EMAIL, "TASKCHUTE_GOOGLE_PASSWORD": _PASSWORD},
+                _EMAIL,
+                _PASSWORD,
+                id="new_env_vars",
+            ),
+            # 古い環境変数からフォールバック
+            pytest.param(
+                {
+                    "TASKCHUTE_USERNAME": "legacy@example.com",
+                    "TASKCHUTE_PASSWORD": "legacy_password",
+                },
+                "legacy@example.com",
+                "legacy_password",
+                id="legacy_env_vars",
+            ),
+            # 新しい環境変数が古い環境変数より優先される
+            pytest.param(
+                {
+                    "TASKCHUTE_GOOGLE_EMAIL": "new@example.com",
+                    "TASKCHUTE_GOOGLE_PASSWORD": "new_password",
+                    "TASKCHUTE_USERNAME": "legacy@example.com",
+                    "TASKCHUTE_PASSWORD": "legacy_password",
+                },
+                "new@example.com",
+                "new_password",
+                id="new_overrides_legacy",
+            ),
+            # 環境変数がない場合、デフォルト値を使用
+            pytest.param({}, "manual-login", "manual-login", id="no_env_vars"),
+            # 部分的な環境変数の場合、デフォルト値で補完
+            pytest.param(
+                {"TASKCHUTE_GOOGLE_EMAIL": "partial@example.com"},
+                "partial@example.com",
+                "manual-login",
+                id="partial_env_vars",
+            ),
+        ],
+    )
+    def test_create_login_from_env(
+        self,
+        clean_env: dict[str, str],
+        env: dict[str, str],
+        expected_email: str,
+        expected_password: str,
+    ):
+        """create_login_from_env: 環境変数から認証情報を解決して作成."""
+        clean_env.update(env)
 
         login = create_login_from_env()
 
-        assert login.google_email == "partial@example.com"
-        assert login.google_password == "manual-login"
+        assert (login.google_email, login.google_password) == (expected_email, expected_password)